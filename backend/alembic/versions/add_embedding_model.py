@@ -0,0 +1,32 @@
+"""tag embeddings with the model that produced them
+
+Revision ID: add_embedding_model
+Revises: add_external_job_embedding
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_embedding_model"
+down_revision: Union[str, Sequence[str], None] = "add_external_job_embedding"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("candidates", "jobs", "external_jobs")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("embedding_model", sa.String(), nullable=True))
+        # Everything embedded so far came from the default model
+        op.execute(
+            f"UPDATE {table} SET embedding_model = 'text-embedding-3-small' WHERE embedding IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "embedding_model")
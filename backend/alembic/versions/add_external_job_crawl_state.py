@@ -0,0 +1,35 @@
+"""posted_at on external_jobs + per-source crawl high-water marks
+
+Revision ID: add_external_job_crawl_state
+Revises: add_external_job_upsert
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_external_job_crawl_state"
+down_revision: Union[str, Sequence[str], None] = "add_external_job_upsert"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("external_jobs", sa.Column("posted_at", sa.DateTime(), nullable=True))
+    op.create_table(
+        "external_job_sync_state",
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("query", sa.String(), nullable=False),
+        sa.Column("region", sa.String(), nullable=False),
+        sa.Column("high_water_mark", sa.DateTime(), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("last_pages", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("source", "query", "region", name="pk_external_job_sync_state"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("external_job_sync_state")
+    op.drop_column("external_jobs", "posted_at")
@@ -0,0 +1,37 @@
+"""cross-source dedup columns on external_jobs
+
+Revision ID: add_external_job_dedup
+Revises: add_external_job_crawl_state
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "add_external_job_dedup"
+down_revision: Union[str, Sequence[str], None] = "add_external_job_crawl_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows start canonical; they are clustered as their sources re-deliver them
+    op.add_column("external_jobs", sa.Column("fingerprint", sa.String(length=64), nullable=True))
+    op.add_column("external_jobs", sa.Column("canonical_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "fk_external_jobs_canonical_id", "external_jobs", "external_jobs",
+        ["canonical_id"], ["id"], ondelete="SET NULL",
+    )
+    op.create_index("ix_external_jobs_fingerprint", "external_jobs", ["fingerprint"])
+    op.create_index("ix_external_jobs_canonical_id", "external_jobs", ["canonical_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_external_jobs_canonical_id", table_name="external_jobs")
+    op.drop_index("ix_external_jobs_fingerprint", table_name="external_jobs")
+    op.drop_constraint("fk_external_jobs_canonical_id", "external_jobs", type_="foreignkey")
+    op.drop_column("external_jobs", "canonical_id")
+    op.drop_column("external_jobs", "fingerprint")
@@ -0,0 +1,25 @@
+"""add embedding to external_jobs
+
+Revision ID: add_external_job_embedding
+Revises: add_match_cache
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+revision: str = "add_external_job_embedding"
+down_revision: Union[str, Sequence[str], None] = "add_match_cache"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("external_jobs", sa.Column("embedding", pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("external_jobs", "embedding")
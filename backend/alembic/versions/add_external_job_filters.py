@@ -0,0 +1,58 @@
+"""remote/numeric salary columns on external_jobs + trigram location indexes
+
+Revision ID: add_external_job_filters
+Revises: add_external_job_payloads
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_external_job_filters"
+down_revision: Union[str, Sequence[str], None] = "add_external_job_payloads"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NUMERIC = r"'^\s*[0-9]+(\.[0-9]+)?\s*$'"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column("external_jobs", sa.Column("salary_min_value", sa.Integer(), nullable=True))
+    op.add_column("external_jobs", sa.Column("salary_max_value", sa.Integer(), nullable=True))
+    op.add_column("external_jobs", sa.Column("remote", sa.Boolean(), nullable=True))
+    # Same derivation as job_aggregator: numeric salary strings, JSearch's remote flag or "remote" in title/location
+    op.execute(
+        f"""
+        UPDATE external_jobs e SET
+            salary_min_value = CASE WHEN salary_min ~ {NUMERIC} THEN
+                CASE WHEN salary_min::numeric < 2000000000 THEN NULLIF(trunc(salary_min::numeric), 0)::int END
+            END,
+            salary_max_value = CASE WHEN salary_max ~ {NUMERIC} THEN
+                CASE WHEN salary_max::numeric < 2000000000 THEN NULLIF(trunc(salary_max::numeric), 0)::int END
+            END,
+            remote = coalesce(
+                (SELECT (p.raw_data->>'job_is_remote')::boolean FROM external_job_payloads p
+                 WHERE p.external_job_id = e.id AND p.raw_data->>'job_is_remote' IN ('true', 'false')),
+                false
+            ) OR coalesce(title, '') ~* '\\mremote\\M' OR coalesce(location, '') ~* '\\mremote\\M'
+        """
+    )
+    op.create_index(
+        "ix_external_jobs_location_trgm", "external_jobs", ["location"],
+        postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_jobs_location_trgm", "jobs", ["location"],
+        postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_location_trgm", table_name="jobs")
+    op.drop_index("ix_external_jobs_location_trgm", table_name="external_jobs")
+    op.drop_column("external_jobs", "remote")
+    op.drop_column("external_jobs", "salary_max_value")
+    op.drop_column("external_jobs", "salary_min_value")
@@ -0,0 +1,48 @@
+"""move external_jobs.raw_data to external_job_payloads; index fetched_at for expiry
+
+Revision ID: add_external_job_payloads
+Revises: add_external_job_dedup
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "add_external_job_payloads"
+down_revision: Union[str, Sequence[str], None] = "add_external_job_dedup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "external_job_payloads",
+        sa.Column("external_job_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("raw_data", postgresql.JSONB(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["external_job_id"], ["external_jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("external_job_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO external_job_payloads (external_job_id, raw_data, fetched_at)
+        SELECT id, raw_data::jsonb, fetched_at FROM external_jobs WHERE raw_data IS NOT NULL
+        """
+    )
+    op.drop_column("external_jobs", "raw_data")
+    op.create_index("ix_external_jobs_fetched_at", "external_jobs", ["fetched_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_external_jobs_fetched_at", table_name="external_jobs")
+    op.add_column("external_jobs", sa.Column("raw_data", sa.JSON(), nullable=True))
+    op.execute(
+        """
+        UPDATE external_jobs e SET raw_data = p.raw_data::json
+        FROM external_job_payloads p WHERE p.external_job_id = e.id
+        """
+    )
+    op.drop_table("external_job_payloads")
@@ -0,0 +1,44 @@
+"""unique (source, external_id) + content hash on external_jobs for bulk upserts
+
+Revision ID: add_external_job_upsert
+Revises: add_similar_job_ids
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_external_job_upsert"
+down_revision: Union[str, Sequence[str], None] = "add_similar_job_ids"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the most recently fetched row of each (source, external_id) so the constraint can be added
+    op.execute(
+        """
+        DELETE FROM external_jobs
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY source, external_id ORDER BY fetched_at DESC NULLS LAST, id
+                ) AS rn
+                FROM external_jobs
+                WHERE external_id IS NOT NULL
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+    op.add_column("external_jobs", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_unique_constraint(
+        "uq_external_jobs_source_external_id", "external_jobs", ["source", "external_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_external_jobs_source_external_id", "external_jobs", type_="unique")
+    op.drop_column("external_jobs", "content_hash")
@@ -0,0 +1,30 @@
+"""keyset indexes on jobs(created_at, id)
+
+Revision ID: add_jobs_created_at_index
+Revises: add_vector_indexes
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_jobs_created_at_index"
+down_revision: Union[str, Sequence[str], None] = "add_vector_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination compares (created_at, id) tuples, so created_at can no longer be NULL
+    op.execute("UPDATE jobs SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column("jobs", "created_at", existing_type=sa.DateTime(), nullable=False, server_default=sa.text("now()"))
+    op.create_index("ix_jobs_created_at_id", "jobs", ["created_at", "id"])
+    op.create_index("ix_jobs_employer_created_at_id", "jobs", ["employer_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_employer_created_at_id", table_name="jobs")
+    op.drop_index("ix_jobs_created_at_id", table_name="jobs")
+    op.alter_column("jobs", "created_at", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,36 @@
+"""matches as a score cache: external job rows + content hash
+
+Revision ID: add_match_cache
+Revises: f6d2b650735e
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "add_match_cache"
+down_revision: Union[str, Sequence[str], None] = "f6d2b650735e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column("matches", "job_id", existing_type=postgresql.UUID(as_uuid=True), nullable=True)
+    op.add_column("matches", sa.Column("external_job_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column("matches", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.create_foreign_key(
+        "fk_matches_external_job_id", "matches", "external_jobs", ["external_job_id"], ["id"], ondelete="CASCADE"
+    )
+    op.create_unique_constraint("uq_match_candidate_external_job", "matches", ["candidate_id", "external_job_id"])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM matches WHERE job_id IS NULL")
+    op.drop_constraint("uq_match_candidate_external_job", "matches", type_="unique")
+    op.drop_constraint("fk_matches_external_job_id", "matches", type_="foreignkey")
+    op.drop_column("matches", "content_hash")
+    op.drop_column("matches", "external_job_id")
+    op.alter_column("matches", "job_id", existing_type=postgresql.UUID(as_uuid=True), nullable=False)
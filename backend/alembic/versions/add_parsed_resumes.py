@@ -0,0 +1,34 @@
+"""add parsed_resumes cache of resume parser output
+
+Revision ID: add_parsed_resumes
+Revises: add_resume_jobs
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "add_parsed_resumes"
+down_revision: Union[str, Sequence[str], None] = "add_resume_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "parsed_resumes",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("parsed", postgresql.JSONB(), nullable=False),
+        sa.Column("warnings", postgresql.JSONB(), nullable=True),
+        sa.Column("ai_used", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("parsed_resumes")
@@ -0,0 +1,44 @@
+"""add resume_jobs for background resume parsing
+
+Revision ID: add_resume_jobs
+Revises: add_external_job_filters
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "add_resume_jobs"
+down_revision: Union[str, Sequence[str], None] = "add_external_job_filters"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "resume_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("candidate_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("file_path", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("result", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_resume_jobs_candidate_id", "resume_jobs", ["candidate_id"])
+    op.create_index("ix_resume_jobs_status_created_at", "resume_jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_resume_jobs_status_created_at", table_name="resume_jobs")
+    op.drop_index("ix_resume_jobs_candidate_id", table_name="resume_jobs")
+    op.drop_table("resume_jobs")
@@ -0,0 +1,28 @@
+"""cache nearest-neighbour job ids per job
+
+Revision ID: add_similar_job_ids
+Revises: add_job_search_vector
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "add_similar_job_ids"
+down_revision: Union[str, Sequence[str], None] = "add_job_search_vector"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left NULL: lists are filled on the next embedding write or the first /jobs/{id}/similar view
+    op.add_column("jobs", sa.Column("similar_job_ids", postgresql.JSONB(), nullable=True))
+    op.add_column("jobs", sa.Column("similar_computed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "similar_computed_at")
+    op.drop_column("jobs", "similar_job_ids")
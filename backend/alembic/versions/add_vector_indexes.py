@@ -0,0 +1,44 @@
+"""HNSW cosine indexes on embedding columns
+
+Revision ID: add_vector_indexes
+Revises: add_embedding_model
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "add_vector_indexes"
+down_revision: Union[str, Sequence[str], None] = "add_embedding_model"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table). m / ef_construction are pgvector's defaults, spelled out so they are easy to tune.
+INDEXES = (
+    ("ix_jobs_embedding_hnsw", "jobs"),
+    ("ix_candidates_embedding_hnsw", "candidates"),
+    ("ix_external_jobs_embedding_hnsw", "external_jobs"),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY so building over an existing table does not block writes; needs to run outside a transaction
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["embedding"],
+                postgresql_using="hnsw",
+                postgresql_with={"m": 16, "ef_construction": 64},
+                postgresql_ops={"embedding": "vector_cosine_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.core.deps import get_current_candidate, require_job_owner, require_application_job_owner
+from app.core.deps import get_current_candidate, get_current_employer, require_job_owner, require_application_job_owner
 from app.core.audit import log as audit_log
 from app.models import Application, Job, Candidate, Employer
 
@@ -56,6 +56,40 @@ def list_applications_by_job(
     return result
 
 
+@router.get("/by-employer/me")
+def list_my_job_applications(
+    limit: int = Query(500, ge=1, le=2000),
+    employer: Employer = Depends(get_current_employer),
+    db: Session = Depends(get_db),
+):
+    """Most recent applications across all of the current employer's jobs, in one query (employer only)."""
+    rows = (
+        db.query(Application, Job.title, Candidate)
+        .join(Job, Job.id == Application.job_id)
+        .outerjoin(Candidate, Candidate.id == Application.candidate_id)
+        .filter(Job.employer_id == employer.id)
+        .order_by(Application.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "id": str(a.id),
+            "job_id": str(a.job_id),
+            "job_title": job_title,
+            "candidate_id": str(a.candidate_id),
+            "candidate_user_id": str(c.user_id) if c else None,
+            "candidate_name": c.full_name if c else None,
+            "candidate_location": c.location if c else None,
+            "candidate_skills": c.skills if c else [],
+            "candidate_experience": c.experience if c else None,
+            "status": a.status,
+            "created_at": a.created_at.isoformat() if a.created_at else None,
+        }
+        for a, job_title, c in rows
+    ]
+
+
 @router.get("/by-candidate/me")
 def list_my_applications(
     candidate: Candidate = Depends(get_current_candidate),
@@ -1,14 +1,23 @@
+import asyncio
+import json
+import time
 from pathlib import Path
-from uuid import UUID
+from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db, get_db
 from app.core.auth import require_candidate, get_current_user
-from app.models import Candidate
+from app.core.deps import get_async_current_candidate
+from app.core.uploads import save_upload
+from app.models import Candidate, ResumeJob
 from app.schemas.candidate import CandidateUpdate
-from app.services.resume_extract import extract_text_from_file
-from app.services.resume_parser import parse_resume_text
+from app.services.resume_extract import extraction_pool
+from app.services.resume_ingest import FINISHED_STATUSES, resume_ingestor, resume_storage_path, submit_resume
 from app.services.job_matcher import update_candidate_embedding_task
 
 router = APIRouter(prefix="/candidates", tags=["candidates"])
@@ -102,60 +111,130 @@ MAX_RESUME_BYTES = 10 * 1024 * 1024  # 10 MB
 ALLOWED_RESUME_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
 MAX_VIDEO_BYTES = 50 * 1024 * 1024  # 50 MB for short intro video
 ALLOWED_VIDEO_TYPES = ("video/webm", "video/mp4", "video/quicktime")
+RESUME_EVENTS_POLL_SECONDS = 1.0
+RESUME_EVENTS_MAX_SECONDS = 120.0  # an SSE stream ends after this; clients fall back to polling
 
 
-def _validate_resume_file(filename: str | None, content: bytes) -> None:
-    if len(content) > MAX_RESUME_BYTES:
-        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
-    fn = (filename or "").lower()
-    if not any(fn.endswith(ext) for ext in ALLOWED_RESUME_EXTENSIONS):
+def _check_resume_name(filename: str) -> None:
+    if not filename.lower().endswith(ALLOWED_RESUME_EXTENSIONS):
         raise HTTPException(status_code=400, detail="Allowed types: PDF, DOCX, TXT")
-    
+
+
+def _check_resume_head(filename: str, head: bytes) -> None:
     # Magic byte validation to verify actual file contents
-    if fn.endswith(".pdf") and not content.startswith(b"%PDF-"):
+    fn = filename.lower()
+    if fn.endswith(".pdf") and not head.startswith(b"%PDF-"):
         raise HTTPException(status_code=400, detail="Invalid PDF format")
-    if fn.endswith((".docx", ".doc")) and not content.startswith(b"PK\x03\x04") and not content.startswith(b"\xd0\xcf\x11\xe0"):
+    if fn.endswith((".docx", ".doc")) and not head.startswith(b"PK\x03\x04") and not head.startswith(b"\xd0\xcf\x11\xe0"):
         # PK... is the signature for ZIP/DOCX; \xd0... is the signature for older DOC files.
         raise HTTPException(status_code=400, detail="Invalid MS Word document format")
 
 
-@router.post("/me/resume")
-def upload_resume_me(
-    background_tasks: BackgroundTasks,
+def _check_video_head(head: bytes) -> None:
+    # Magic byte validation for video files
+    if head:
+        magic = head[:12]
+        is_webm = magic.startswith(b"\x1aE\xdf\xa3")
+        is_mp4 = b"ftyp" in magic
+        if not (is_webm or is_mp4):
+            raise HTTPException(status_code=400, detail="Invalid video format signature")
+
+
+def _resume_job_response(job: ResumeJob) -> dict:
+    out = {
+        "job_id": str(job.id),
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if job.status == "done" and job.result:
+        out.update(parsed=job.result.get("parsed"), warnings=job.result.get("warnings", []), ai_used=job.result.get("ai_used", False))
+    return out
+
+
+async def _get_resume_job(db: AsyncSession, job_id: UUID, candidate_id) -> ResumeJob:
+    job = await db.get(ResumeJob, job_id)
+    if not job or job.candidate_id != candidate_id:
+        raise HTTPException(status_code=404, detail="Resume job not found")
+    return job
+
+
+async def _queue_resume(db: AsyncSession, candidate: Candidate, file: UploadFile) -> dict:
+    filename = file.filename or "resume.pdf"
+    _check_resume_name(filename)
+    job_id = uuid4()
+    path = resume_storage_path(job_id, filename)
+    await run_in_threadpool(
+        save_upload, file, path,
+        max_bytes=MAX_RESUME_BYTES,
+        check_head=lambda head: _check_resume_head(filename, head),
+        too_large="File too large (max 10MB)",
+    )
+    job = await submit_resume(db, job_id, candidate.id, filename, str(path))
+    return _resume_job_response(job)
+
+
+@router.post("/me/resume", status_code=202)
+async def upload_resume_me(
     file: UploadFile = File(...),
-    current: dict = Depends(require_candidate),
-    db: Session = Depends(get_db),
+    candidate: Candidate = Depends(get_async_current_candidate),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Upload resume, parse (AI or fallback), and update candidate profile (candidate-only)."""
-    candidate = db.query(Candidate).filter(Candidate.user_id == current["user_id"]).first()
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-    content = file.file.read()
-    _validate_resume_file(file.filename, content)
-    try:
-        text = extract_text_from_file(content, file.filename or "resume.pdf")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    try:
-        parsed, warnings, ai_used = parse_resume_text(text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    if parsed.get("full_name"):
-        candidate.full_name = parsed["full_name"]
-    if parsed.get("location"):
-        candidate.location = parsed["location"]
-    if parsed.get("skills"):
-        candidate.skills = parsed["skills"]
-    if parsed.get("education"):
-        candidate.education = parsed["education"]
-    if parsed.get("experience"):
-        candidate.experience = parsed["experience"]
-    candidate.resume_parsed_data = parsed
-    if hasattr(candidate, "resume_text"):
-        candidate.resume_text = text
-    db.commit()
-    background_tasks.add_task(update_candidate_embedding_task, str(candidate.id))
-    return {"status": "ok", "parsed": parsed, "warnings": warnings, "ai_used": ai_used}
+    """
+    Upload a resume for parsing (AI or fallback) into the candidate profile (candidate-only).
+    Returns a job id immediately; poll GET /candidates/me/resume/jobs/{job_id} (or its /events stream) for the result.
+    """
+    return await _queue_resume(db, candidate, file)
+
+
+@router.get("/resume/status")
+def resume_pipeline_status(current: dict = Depends(get_current_user)):
+    """Resume workers busy right now and text-extraction timings per format (pdf, docx, txt). Signed-in users only."""
+    return {"workers": resume_ingestor.snapshot(), "extraction": extraction_pool.snapshot()}
+
+
+@router.get("/me/resume/jobs/{job_id}")
+async def get_resume_job(
+    job_id: UUID,
+    candidate: Candidate = Depends(get_async_current_candidate),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Status of a resume upload; once done, includes parsed, warnings and ai_used (candidate-only)."""
+    return _resume_job_response(await _get_resume_job(db, job_id, candidate.id))
+
+
+@router.get("/me/resume/jobs/{job_id}/events")
+async def stream_resume_job(
+    job_id: UUID,
+    candidate: Candidate = Depends(get_async_current_candidate),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Server-sent events: one `status` event per state change, ending with the done/failed result."""
+    await _get_resume_job(db, job_id, candidate.id)
+    return StreamingResponse(
+        _resume_job_events(job_id, candidate.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _resume_job_events(job_id: UUID, candidate_id):
+    # Own session per poll: the request-scoped one may be closed before the body is streamed
+    deadline = time.monotonic() + RESUME_EVENTS_MAX_SECONDS
+    last_status = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ResumeJob, job_id)
+        if job is None or job.candidate_id != candidate_id:
+            return
+        if job.status != last_status:
+            last_status = job.status
+            yield f"event: status\ndata: {json.dumps(_resume_job_response(job))}\n\n"
+        if job.status in FINISHED_STATUSES or time.monotonic() >= deadline:
+            return
+        yield ": keep-alive\n\n"
+        await asyncio.sleep(RESUME_EVENTS_POLL_SECONDS)
 
 
 @router.post("/me/video")
@@ -168,25 +247,15 @@ def upload_video_me(
     candidate = db.query(Candidate).filter(Candidate.user_id == current["user_id"]).first()
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
-    content = file.file.read()
-    if len(content) > MAX_VIDEO_BYTES:
-        raise HTTPException(status_code=400, detail="Video too large (max 50MB)")
     ct = (file.content_type or "").lower()
     if ct not in ALLOWED_VIDEO_TYPES and not (file.filename or "").lower().endswith((".webm", ".mp4", ".mov")):
         raise HTTPException(status_code=400, detail="Allowed: WebM, MP4")
-
-    # Magic byte validation for video files
-    if content:
-        magic = content[:12]
-        is_webm = magic.startswith(b"\x1aE\xdf\xa3")
-        is_mp4 = b"ftyp" in magic
-        if not (is_webm or is_mp4):
-            raise HTTPException(status_code=400, detail="Invalid video format signature")
     uploads_root = Path(__file__).resolve().parent.parent.parent / "uploads" / "videos"
-    uploads_root.mkdir(parents=True, exist_ok=True)
     ext = ".webm" if "webm" in ct else ".mp4" if "mp4" in ct or "quicktime" in ct else ".webm"
-    path = uploads_root / f"{candidate.id}{ext}"
-    path.write_bytes(content)
+    save_upload(
+        file, uploads_root / f"{candidate.id}{ext}",
+        max_bytes=MAX_VIDEO_BYTES, check_head=_check_video_head, too_large="Video too large (max 50MB)",
+    )
     candidate.video_url = f"/uploads/videos/{candidate.id}{ext}"
     db.commit()
     return {"status": "ok", "video_url": candidate.video_url}
@@ -256,47 +325,18 @@ def update_candidate_by_user(
     return {"status": "ok"}
 
 
-@router.post("/by-user/{user_id}/resume")
-def upload_and_parse_resume(
+@router.post("/by-user/{user_id}/resume", status_code=202)
+async def upload_and_parse_resume(
     user_id: UUID,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Upload resume, parse with AI, and update candidate profile (self only)."""
+    """Upload a resume for parsing into the candidate profile (self only). Returns a job id, as /me/resume does."""
     if current["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Forbidden")
-    candidate = db.query(Candidate).filter(Candidate.user_id == user_id).first()
+    result = await db.execute(select(Candidate).where(Candidate.user_id == user_id))
+    candidate = result.scalars().first()
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
-
-    content = file.file.read()
-    _validate_resume_file(file.filename, content)
-
-    try:
-        text = extract_text_from_file(content, file.filename or "resume.pdf")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-    try:
-        parsed, warnings, ai_used = parse_resume_text(text)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-    # Update candidate with parsed data
-    if parsed.get("full_name"):
-        candidate.full_name = parsed["full_name"]
-    if parsed.get("location"):
-        candidate.location = parsed["location"]
-    if parsed.get("skills"):
-        candidate.skills = parsed["skills"]
-    if parsed.get("education"):
-        candidate.education = parsed["education"]
-    if parsed.get("experience"):
-        candidate.experience = parsed["experience"]
-    candidate.resume_parsed_data = parsed
-    db.commit()
-    background_tasks.add_task(update_candidate_embedding_task, str(candidate.id))
-
-    return {"status": "ok", "parsed": parsed, "warnings": warnings, "ai_used": ai_used}
+    return await _queue_resume(db, candidate, file)
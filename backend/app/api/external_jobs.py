@@ -1,24 +1,50 @@
 """External job aggregation API."""
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.db.session import get_db
-from app.services.job_aggregator import get_external_jobs, fetch_all_sources
+from app.core.auth import get_current_user, get_current_user_optional
+from app.services.ingestion import ingestion_scheduler
+from app.services.job_aggregator import external_reads, read_external_jobs
+from app.services.upstream import source_status
 
 router = APIRouter(prefix="/external-jobs", tags=["external-jobs"])
 
 
 @router.get("")
-def list_external_jobs(
+async def list_external_jobs(
     limit: int = Query(50, le=100),
     refresh: bool = Query(False),
-    q: str | None = Query(None, description="Search query - triggers fetch from JSearch/Indeed"),
-    db: Session = Depends(get_db),
+    q: str | None = Query(None, description="Full-text search in title/description; also queued for background refresh"),
+    location: str | None = Query(None, description="Filter by location (contains)"),
+    remote: bool | None = Query(None, description="Filter by remote flag"),
+    salary_min: int | None = Query(None, ge=0, description="Only jobs whose salary range reaches this amount"),
+    salary_max: int | None = Query(None, ge=0, description="Only jobs whose salary range starts at or below this amount"),
+    current: dict | None = Depends(get_current_user_optional),
 ):
     """
-    List jobs from Adzuna, JSearch (LinkedIn/Indeed/Glassdoor), and Indeed.
-    Set refresh=true to fetch fresh data. Use q for search-triggered fetch.
+    List jobs from Adzuna, JSearch (LinkedIn/Indeed/Glassdoor), and Indeed, as already stored, filtered in SQL.
+    Listings are refreshed by the background ingestion scheduler; refresh=true queues an extra refresh
+    (for q, if given) without waiting for it; it is limited to signed-in employers (403 otherwise).
+    503 with Retry-After when too many searches are queued.
     """
+    if refresh and (current is None or current.get("role") != "employer"):
+        raise HTTPException(status_code=403, detail="Requires employer role to refresh listings")
+    ingestion_scheduler.note_search(q)
     if refresh:
-        fetch_all_sources(db, query=q or "software engineer")
-    return get_external_jobs(db, limit=limit, query=q)
+        ingestion_scheduler.request_refresh(q or "software engineer")
+    return await read_external_jobs(
+        limit=limit,
+        q=q,
+        location=location,
+        remote=remote,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+
+
+@router.get("/status")
+def external_sources_status(current: dict = Depends(get_current_user)):
+    """
+    Per-source upstream health (calls made, retries, circuit state, provider-reported quota remaining)
+    and request-path read load (in flight, queue depth, rejections). Signed-in users only.
+    """
+    return {"sources": source_status(), "reads": external_reads().snapshot()}
@@ -1,49 +1,140 @@
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func, select, tuple_
 
 from app.db.session import get_db
 from app.core.deps import get_current_employer, require_job_owner
 from app.core.audit import log as audit_log
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.db.text_search import build_tsquery, text_match, text_rank
 from app.models import Job, Employer, Application
-from app.schemas.job import JobCreate, JobUpdate, JobResponse
+from app.schemas.job import JobCreate, JobUpdate, JobResponse, JobListItem
 from app.services.job_matcher import update_job_embedding_task
+from app.services.similar_jobs import SIMILAR_JOBS_CACHED, refresh_similar_jobs_sync, similar_jobs_stale
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
-@router.get("/mine", response_model=list[JobResponse])
+# Fields a list row can carry; the embedding vector is deliberately not selectable
+JOB_LIST_FIELDS = ("id", "employer_id", "title", "description", "requirements", "location", "remote", "created_at")
+DEFAULT_JOB_LIST_FIELDS = ("id", "employer_id", "title", "description", "requirements", "location", "remote")
+# Extra fields for the owner's own list (not exposed on the public listing)
+MY_JOB_LIST_FIELDS = (*JOB_LIST_FIELDS, "applicant_count")
+JOB_PAGE_DEFAULT = 50
+JOB_PAGE_MAX = 200
+
+
+def _parse_fields(fields: str | None, allowed: tuple[str, ...] = JOB_LIST_FIELDS) -> tuple[str, ...]:
+    if not fields or not fields.strip():
+        return DEFAULT_JOB_LIST_FIELDS
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return requested
+
+
+def _applicant_count():
+    """Applications per job as a correlated count (served by the application job_id index)."""
+    return (
+        select(func.count(Application.id))
+        .where(Application.job_id == Job.id)
+        .correlate(Job)
+        .scalar_subquery()
+        .label("applicant_count")
+    )
+
+
+def _job_page(
+    query, fields: tuple[str, ...], limit: int, cursor: str | None, response: Response, rank=None
+) -> list[dict]:
+    """
+    One keyset page of jobs, loading only the requested columns. Newest first on the (created_at, id) index,
+    or by `rank` (a relevance expression) descending when given. Sets X-Next-Cursor when more rows follow.
+    """
+    columns = list(dict.fromkeys([*fields, "id", "created_at"]))  # id + created_at are the cursor
+    entities = [_applicant_count() if c == "applicant_count" else getattr(Job, c) for c in columns]
+    if rank is not None:
+        entities.append(rank.label("rank"))
+    sort_key = Job.created_at if rank is None else rank
+    mode = "recent" if rank is None else "relevance"
+    query = query.with_entities(*entities)
+    if cursor:
+        # The cursor carries its mode so it cannot be replayed under another order (timestamp vs float8 key)
+        cursor_mode, key, job_id = decode_cursor(cursor, 3)
+        if cursor_mode != mode:
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested ranking")
+        try:
+            if mode == "recent" and not isinstance(key, datetime):
+                raise TypeError("cursor key")
+            key = key if mode == "recent" else float(key)
+            query = query.filter(tuple_(sort_key, Job.id) < tuple_(key, UUID(job_id)))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = query.order_by(sort_key.desc(), Job.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            mode, last.created_at if rank is None else last.rank, last.id
+        )
+    return [{f: getattr(row, f) for f in fields} for row in rows]
+
+
+@router.get("/mine", response_model=list[JobListItem], response_model_exclude_unset=True)
 def list_my_jobs(
+    response: Response,
+    fields: str | None = Query(None, description="Comma-separated fields to return (default: all list fields)"),
+    limit: int = Query(JOB_PAGE_DEFAULT, ge=1, le=JOB_PAGE_MAX),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor"),
     employer: Employer = Depends(get_current_employer),
     db: Session = Depends(get_db),
 ):
-    """List current employer's jobs (employer only)."""
-    return db.query(Job).filter(Job.employer_id == employer.id).order_by(Job.id.desc()).all()
+    """
+    List current employer's jobs, newest first (employer only). Paginated via X-Next-Cursor. Besides the
+    list fields, `applicant_count` can be requested.
+    """
+    query = db.query(Job).filter(Job.employer_id == employer.id)
+    return _job_page(query, _parse_fields(fields, MY_JOB_LIST_FIELDS), limit, cursor, response)
 
 
-@router.get("", response_model=list[JobResponse])
+@router.get("", response_model=list[JobListItem], response_model_exclude_unset=True)
 def list_jobs(
+    response: Response,
     employer_id: UUID | None = Query(None),
-    q: str | None = Query(None, description="Search by title or description"),
+    q: str | None = Query(None, description="Search by title or description (full-text, prefix-matched)"),
     location: str | None = Query(None),
     remote: bool | None = Query(None),
+    sort: Literal["relevance", "recent"] = Query("relevance", description="Order for q searches; recent otherwise"),
+    fields: str | None = Query(None, description="Comma-separated fields to return (default: all list fields)"),
+    limit: int = Query(JOB_PAGE_DEFAULT, ge=1, le=JOB_PAGE_MAX),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor"),
     db: Session = Depends(get_db),
 ):
-    """List jobs with optional filters (public)."""
+    """
+    List jobs with optional filters (public). Searches rank by text relevance unless sort=recent; everything
+    else is newest first. Paginated via X-Next-Cursor.
+    """
     query = db.query(Job)
+    rank = None
     if employer_id:
         query = query.filter(Job.employer_id == employer_id)
-    if q and q.strip():
-        term = f"%{q.strip()}%"
-        query = query.filter(
-            or_(Job.title.ilike(term), func.coalesce(Job.description, "").ilike(term))
-        )
+    tsquery = build_tsquery(q)
+    if tsquery:
+        query = query.filter(text_match(Job.search_vector, tsquery))
+        if sort == "relevance":
+            rank = text_rank(Job.search_vector, tsquery)
     if location and location.strip():
         query = query.filter(Job.location.ilike(f"%{location.strip()}%"))
     if remote is not None:
         query = query.filter(Job.remote == remote)
-    return query.order_by(Job.id.desc()).all()
+    return _job_page(query, _parse_fields(fields), limit, cursor, response, rank=rank)
 
 
 @router.get("/{job_id}", response_model=JobResponse)
@@ -55,19 +146,33 @@ def get_job(job_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/{job_id}/similar")
-def get_similar_jobs(job_id: UUID, limit: int = Query(5, le=10), db: Session = Depends(get_db)):
-    """Get jobs with similar title (exclude current job)."""
+def get_similar_jobs(job_id: UUID, limit: int = Query(5, le=SIMILAR_JOBS_CACHED), db: Session = Depends(get_db)):
+    """
+    Jobs nearest to this one by embedding (exclude current job). Served from the job's cached neighbour list,
+    recomputed on view when missing or older than SIMILAR_JOBS_TTL_SECONDS; jobs without an embedding fall back to a full-text title match.
+    """
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    # Simple similarity: jobs with overlapping words in title
-    words = [w for w in job.title.lower().split() if len(w) > 2][:3]
-    if not words:
-        similar = db.query(Job).filter(Job.id != job_id).limit(limit).all()
+    columns = (Job.id, Job.title, Job.location, Job.remote)
+
+    if job.embedding is not None:
+        similar_ids = job.similar_job_ids
+        if similar_jobs_stale(job):
+            similar_ids = refresh_similar_jobs_sync(job.id, job.embedding)
+        wanted = [UUID(i) for i in similar_ids[:limit]]
+        rows = {r.id: r for r in db.query(*columns).filter(Job.id.in_(wanted)).all()} if wanted else {}
+        similar = [rows[i] for i in wanted if i in rows]  # cached order; deleted jobs drop out
     else:
-        from sqlalchemy import or_
-        filters = [Job.title.ilike(f"%{w}%") for w in words]
-        similar = db.query(Job).filter(Job.id != job_id).filter(or_(*filters)).limit(limit).all()
+        query = db.query(*columns).filter(Job.id != job_id)
+        words = " ".join(w for w in job.title.lower().split() if len(w) > 2)
+        tsquery = build_tsquery(words, match_any=True)
+        if tsquery:
+            rank = text_rank(Job.search_vector, tsquery)
+            query = query.filter(text_match(Job.search_vector, tsquery)).order_by(rank.desc(), Job.created_at.desc())
+        else:
+            query = query.order_by(Job.created_at.desc())
+        similar = query.limit(limit).all()
     return [
         {"id": str(j.id), "title": j.title, "location": j.location, "remote": j.remote}
         for j in similar
@@ -1,17 +1,31 @@
 """Job-candidate matching API."""
-from uuid import UUID, uuid4
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+import json
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_, func
-import asyncio
+from sqlalchemy import Float, String, and_, cast, func, literal, null, or_, tuple_, union_all
 
-from app.db.session import get_db, get_async_db
+from app.core.config import get_settings
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.db.session import AsyncSessionLocal, get_async_db
+from app.db.text_search import build_tsquery, text_match, text_rank
+from app.db.vector_search import apply_vector_search_settings
 from app.core.deps import get_async_current_candidate, get_async_optional_candidate
 from app.models import Job, Candidate, ExternalJob, Employer
-from app.services.job_matcher import compute_match_score, generate_embedding, get_candidate_text
-from app.services.job_aggregator import get_external_jobs
+from app.services.embeddings import get_candidate_text
+from app.services.job_matcher import generate_embedding
+from app.services.ingestion import ingestion_scheduler
+from app.services.match_cache import get_match_scores_cached
+from app.services.job_aggregator import (
+    external_job_columns,
+    external_job_filters,
+    external_job_to_dict,
+    read_external_jobs,
+)
 
 router = APIRouter(prefix="/matching", tags=["matching"])
 
@@ -38,6 +52,32 @@ def _candidate_to_dict(c: Candidate) -> dict:
     }
 
 
+def _platform_job_select(*extra_columns):
+    """Only the columns a job card needs, with the employer name joined in (never the embedding vector)."""
+    return select(
+        Job.id,
+        Job.title,
+        Job.location,
+        Job.description,
+        Job.remote,
+        Employer.company_name.label("company"),
+        *extra_columns,
+    ).outerjoin(Employer, Employer.id == Job.employer_id)
+
+
+def _platform_job_item(row, description_chars: int | None = None) -> dict:
+    description = row.description or ""
+    return {
+        "id": str(row.id),
+        "source": "platform",
+        "title": row.title,
+        "company": row.company,
+        "location": row.location,
+        "description": description[:description_chars] if description_chars else description,
+        "remote": row.remote,
+    }
+
+
 def _fast_vector_score(distance: float | None) -> int:
     """Convert pgvector cosine distance (0=identical, 1=orthogonal) to a 0-100 score."""
     if distance is None:
@@ -53,7 +93,6 @@ async def get_recommended_jobs(
     candidate: Candidate = Depends(get_async_current_candidate),
     limit: int = Query(20, le=50),
     async_db: AsyncSession = Depends(get_async_db),
-    sync_db: Session = Depends(get_db),
 ):
     """Get jobs recommended for the current candidate leveraging pgvector similarity search."""
     
@@ -63,167 +102,412 @@ async def get_recommended_jobs(
         emb = await generate_embedding(cand_text)
         if emb:
             candidate.embedding = emb
+            candidate.embedding_model = get_settings().OPENAI_EMBEDDING_MODEL
             await async_db.commit()
 
     results = []
     
-    # 2. Vectorized nearest-neighbor query for Platform Jobs (O(1) milliseconds scale)
+    # 2. Approximate nearest-neighbour query (HNSW index per branch) over platform and external jobs in one ranking
     if candidate.embedding is not None:
-        dist_expr = Job.embedding.cosine_distance(candidate.embedding).label("distance")
-        stmt = (
-            select(Job, dist_expr)
+        platform_dist = Job.embedding.cosine_distance(candidate.embedding)
+        external_dist = ExternalJob.embedding.cosine_distance(candidate.embedding)
+        platform_nn = (
+            select(literal("platform").label("kind"), Job.id.label("id"), platform_dist.label("distance"))
             .where(Job.embedding != None)
-            .order_by(dist_expr)
+            .order_by(platform_dist)
             .limit(limit)
+            .subquery()
         )
-        result = await async_db.execute(stmt)
-        for job, distance in result.all():
-            employer_res = await async_db.execute(select(Employer).where(Employer.id == job.employer_id))
-            employer = employer_res.scalars().first()
-            
-            job_dict = {
-                "id": str(job.id),
-                "source": "platform",
-                "title": job.title,
-                "company": employer.company_name if employer else None,
-                "location": job.location,
-                "description": job.description or "",
-                "remote": job.remote,
-            }
-            results.append({
-                **job_dict,
-                "match_score": _fast_vector_score(float(distance)) if distance is not None else 75,
+        external_nn = (
+            select(literal("external").label("kind"), ExternalJob.id.label("id"), external_dist.label("distance"))
+            .where(ExternalJob.embedding != None, ExternalJob.canonical_id == None)
+            .order_by(external_dist)
+            .limit(limit)
+            .subquery()
+        )
+        ranked = union_all(select(platform_nn), select(external_nn)).subquery()
+        await apply_vector_search_settings(async_db, limit)
+        result = await async_db.execute(select(ranked).order_by(ranked.c.distance).limit(limit))
+        rows = result.all()
+
+        platform_ids = [r.id for r in rows if r.kind == "platform"]
+        external_ids = [r.id for r in rows if r.kind == "external"]
+        platform_by_id = {}
+        if platform_ids:
+            jobs_res = await async_db.execute(_platform_job_select().where(Job.id.in_(platform_ids)))
+            platform_by_id = {r.id: _platform_job_item(r) for r in jobs_res.all()}
+        external_by_id = {}
+        if external_ids:
+            ext_res = await async_db.execute(
+                select(*external_job_columns()).where(ExternalJob.id.in_(external_ids))
+            )
+            external_by_id = {r.id: external_job_to_dict(r) for r in ext_res.all()}
+
+        for row in rows:
+            distance = float(row.distance)
+            match = {
+                "match_score": _fast_vector_score(distance),
                 "match_reason": "Matched via scalable vector semantic search.",
-                "suggested_for_you": True if distance is not None and float(distance) < 0.25 else False,
-            })
+                "suggested_for_you": distance < 0.25,
+            }
+            item = (external_by_id if row.kind == "external" else platform_by_id).get(row.id)
+            if item:
+                results.append({**item, **match})
     else:
         # Fallback if embeddings fail entirely
-        result = await async_db.execute(select(Job).limit(limit))
-        for job in result.scalars().all():
+        result = await async_db.execute(_platform_job_select().limit(limit))
+        for row in result.all():
             results.append({
-                "id": str(job.id),
-                "source": "platform",
-                "title": job.title,
-                "company": "Platform Employer",
-                "location": job.location,
-                "description": job.description or "",
-                "remote": job.remote,
+                **_platform_job_item(row),
                 "match_score": 50,
                 "match_reason": "Semantic search unavailable.",
                 "suggested_for_you": False,
             })
 
-    # 3. External jobs (Fallback to sync API call + slow LLM score if needed)
-    # Run sync aggregator in executor to not block async loop
-    loop = asyncio.get_event_loop()
-    external = await loop.run_in_executor(None, get_external_jobs, sync_db, min(limit, 10))
-    
-    cand_dict = _candidate_to_dict(candidate)
-    for ext in external:
-        # We compute LLM match for a small number of external jobs (since no embeddings natively)
-        match = compute_match_score(cand_dict, ext)
-        results.append({
-            **ext,
-            "match_score": match["score"],
-            "match_reason": match["reason"],
-            "suggested_for_you": match.get("suggested_for_you", False),
-        })
+        # 3. External jobs without a candidate vector: cached, batched LLM scoring
+        external = await read_external_jobs(min(limit, 10))
+
+        cand_dict = _candidate_to_dict(candidate)
+        matches = await get_match_scores_cached(async_db, cand_dict, external)
+        for ext, match in zip(external, matches):
+            results.append({
+                **ext,
+                "match_score": match["score"],
+                "match_reason": match["reason"],
+                "suggested_for_you": match.get("suggested_for_you", False),
+            })
 
     # Sort: suggested first, then score
     results.sort(key=lambda x: (x.get("suggested_for_you", False), x.get("match_score", 0)), reverse=True)
     return results[:limit]
 
 
-@router.get("/browse")
-async def browse_all_jobs(
-    candidate: Candidate | None = Depends(get_async_optional_candidate),
-    include_external: bool = Query(True),
-    q: str | None = Query(None, description="Search in title/description"),
-    location: str | None = Query(None, description="Filter by location (contains)"),
-    remote: bool | None = Query(None, description="Filter by remote-only"),
-    async_db: AsyncSession = Depends(get_async_db),
-    sync_db: Session = Depends(get_db),
+BROWSE_PAGE_DEFAULT = 50
+BROWSE_PAGE_MAX = 100
+BROWSE_STREAM_CHUNK = 20
+# Sort key for rows that have no embedding yet: past the largest cosine distance (2.0), so they sort last
+NO_DISTANCE = 3.0
+_EPOCH = datetime(1970, 1, 1)
+
+
+BrowseRanking = Literal["auto", "semantic", "lexical", "recent"]
+
+
+async def _resolve_ranking(ranking: str, candidate: Candidate | None, tsquery: str | None, q: str | None):
+    """
+    Pick the browse order and, for semantic ranking, the vector to rank against.
+    auto: semantic for candidates with an embedding, lexical when searching, recent otherwise.
+    semantic: the candidate's profile embedding, else an embedding of q. lexical needs a searchable q.
+    Returns (mode, vector); modes that cannot apply fall back to lexical, then recent.
+    """
+    candidate_vector = candidate.embedding if candidate is not None else None
+    if ranking in ("auto", "semantic"):
+        if candidate_vector is not None:
+            return "semantic", candidate_vector
+        if ranking == "semantic" and q and q.strip():
+            query_vector = await generate_embedding(q.strip())
+            if query_vector:
+                return "semantic", query_vector
+    if ranking != "recent" and tsquery:
+        return "lexical", None
+    return "recent", None
+
+
+def _decode_browse_cursor(cursor: str | None, mode: str):
+    """
+    (after, depth) from a browse cursor: `after` is the (sort_key, kind, id) of the last row served, `depth`
+    how many rows came before the next page. 400 if the cursor is malformed or was made under another mode.
+    """
+    if not cursor:
+        return None, 0
+    cursor_mode, sort_key, kind, row_id, depth = decode_cursor(cursor, 5)
+    if cursor_mode != mode:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested ranking")
+    try:
+        if mode == "recent" and not isinstance(sort_key, datetime):
+            raise TypeError("cursor key")
+        sort_value = sort_key if mode == "recent" else float(sort_key)
+        if kind not in ("platform", "external") or not isinstance(depth, int) or depth < 0:
+            raise ValueError("cursor fields")
+        return (sort_value, kind, UUID(row_id)), depth
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_in_branch(sort_key, kind: str, id_column, after) -> tuple:
+    """(sort_key, kind, id) > after, for a branch whose kind is the constant `kind`."""
+    if after is None:
+        return ()
+    value, after_kind, after_id = after
+    if kind > after_kind:
+        return (sort_key >= value,)
+    if kind < after_kind:
+        return (sort_key > value,)
+    return (or_(sort_key > value, and_(sort_key == value, id_column > after_id)),)
+
+
+def _browse_union(
+    candidate: Candidate | None,
+    mode: str,
+    rank_vector,
+    q: str | None,
+    location: str | None,
+    remote: bool | None,
+    salary_min: int | None,
+    salary_max: int | None,
+    include_external: bool,
+    after=None,
+    limit: int | None = None,
 ):
-    """Browse all jobs (platform + external) asynchronously."""
-    
-    stmt = select(Job)
-    if q and q.strip():
-        q_pattern = f"%{q.strip()}%"
-        stmt = stmt.where(or_(Job.title.ilike(q_pattern), func.coalesce(Job.description, "").ilike(q_pattern)))
+    """
+    Platform and external listings as one projected UNION ALL with a common sort_key for `mode`:
+    cosine distance to `rank_vector` (semantic), text relevance (lexical) or recency.
+    `distance` is always the distance to the candidate's own embedding (NULL without one) and drives scoring.
+    Filters are applied per branch in SQL; the external branch uses the same builder as /external-jobs.
+
+    Semantic mode takes the page's keyset position (`after`) and size (`limit`) up front: each embedded branch
+    is ordered by its raw cosine distance with its own LIMIT, so the HNSW index serves it (as in
+    get_recommended_jobs), and rows without an embedding follow as trailing branches keyed NO_DISTANCE.
+    """
+    tsquery = build_tsquery(q)
+    candidate_vector = candidate.embedding if candidate is not None else None
+
+    def distance_column(model):
+        if candidate_vector is not None:
+            return model.embedding.cosine_distance(candidate_vector).label("distance")
+        return null().cast(Float).label("distance")
+
+    remote = True if remote else None  # browse only narrows to remote-only, never to on-site only
+    platform_filters = []
+    if tsquery:
+        platform_filters.append(text_match(Job.search_vector, tsquery))
     if location and location.strip():
-        loc_pattern = f"%{location.strip()}%"
-        stmt = stmt.where(func.coalesce(Job.location, "").ilike(loc_pattern))
-    if remote is True:
-        stmt = stmt.where(Job.remote == True)
-        
-    # If candidate is logged in and has embedding, sort by distance!
-    if candidate and candidate.embedding is not None:
-        dist_expr = Job.embedding.cosine_distance(candidate.embedding).label("distance")
-        stmt = stmt.add_columns(dist_expr)
-        stmt = stmt.order_by(dist_expr)
-    
-    result = await async_db.execute(stmt)
-    
-    results = []
-    # If we added columns, result.all() returns tuples
-    if candidate and candidate.embedding is not None:
-        rows = result.all()
+        platform_filters.append(Job.location.ilike(f"%{location.strip()}%"))
+    if remote:
+        platform_filters.append(Job.remote == True)
+    if salary_min is not None:
+        platform_filters.append(func.coalesce(Job.salary_max, Job.salary_min) >= salary_min)
+    if salary_max is not None:
+        platform_filters.append(func.coalesce(Job.salary_min, Job.salary_max) <= salary_max)
+
+    def platform_select(sort_key, *where):
+        return _platform_job_select(
+            literal("platform").label("kind"),
+            literal("platform").label("source"),
+            null().cast(String).label("url"),
+            cast(Job.salary_min, String).label("salary_min"),
+            cast(Job.salary_max, String).label("salary_max"),
+            distance_column(Job),
+            sort_key.label("sort_key"),
+        ).where(*platform_filters, *where)
+
+    def external_select(sort_key, *where):
+        return select(
+            ExternalJob.id,
+            ExternalJob.title,
+            ExternalJob.location,
+            ExternalJob.description,
+            ExternalJob.remote,
+            ExternalJob.company,
+            literal("external").label("kind"),
+            ExternalJob.source,
+            ExternalJob.url,
+            ExternalJob.salary_min,
+            ExternalJob.salary_max,
+            distance_column(ExternalJob),
+            sort_key.label("sort_key"),
+        ).where(*external_job_filters(q, location, remote, salary_min, salary_max), *where)
+
+    branches = [("platform", Job, platform_select)]
+    if include_external:
+        branches.append(("external", ExternalJob, external_select))
+
+    if mode != "semantic":
+        selects = []
+        for kind, model, build in branches:
+            if mode == "lexical":
+                sort_key = text_rank(model.search_vector, tsquery)
+            else:
+                sort_key = func.coalesce(Job.created_at if model is Job else ExternalJob.fetched_at, _EPOCH)
+            selects.append(build(sort_key))
+        return selects[0].subquery() if len(selects) == 1 else union_all(*selects).subquery()
+
+    ranked, unranked = [], []
+    for kind, model, build in branches:
+        distance = model.embedding.cosine_distance(rank_vector)
+        ranked.append(
+            build(distance, model.embedding != None, *_after_in_branch(distance, kind, model.id, after))
+            .order_by(distance)
+            .limit(limit)
+            .subquery()
+        )
+        no_distance = literal(NO_DISTANCE, Float)
+        unranked.append(
+            build(no_distance, model.embedding == None, *_after_in_branch(no_distance, kind, model.id, after))
+            .order_by(model.id)
+            .limit(limit)
+            .subquery()
+        )
+    return union_all(*(select(branch) for branch in [*ranked, *unranked])).subquery()
+
+
+def _browse_page_stmt(union, mode: str, after, limit: int):
+    """
+    Keyset page over the union: ascending distance (semantic), descending relevance or recency,
+    ties broken by (kind, id). Semantic branches already start after the cursor (see _browse_union).
+    """
+    key = tuple_(union.c.sort_key, union.c.kind, union.c.id)
+    ascending = mode == "semantic"
+    stmt = select(union)
+    if after is not None and not ascending:
+        sort_value, kind, row_id = after
+        stmt = stmt.where(key < tuple_(literal(sort_value), literal(kind), literal(row_id)))
+    if ascending:
+        stmt = stmt.order_by(union.c.sort_key, union.c.kind, union.c.id)
     else:
-        rows = [(job, None) for job in result.scalars().all()]
-        
-    for job, distance in rows:
-        employer_res = await async_db.execute(select(Employer).where(Employer.id == job.employer_id))
-        employer = employer_res.scalars().first()
-        item = {
-            "id": str(job.id),
-            "source": "platform",
-            "title": job.title,
-            "company": employer.company_name if employer else None,
-            "location": job.location,
-            "description": (job.description or "")[:300],
-            "remote": job.remote,
-        }
-        if candidate:
-            if distance is not None:
-                item["match_score"] = _fast_vector_score(float(distance))
+        stmt = stmt.order_by(union.c.sort_key.desc(), union.c.kind.desc(), union.c.id.desc())
+    return stmt.limit(limit)
+
+
+def _browse_item(row) -> dict:
+    if row.kind == "platform":
+        return _platform_job_item(row, description_chars=300)
+    return external_job_to_dict(row)
+
+
+async def _score_browse_rows(async_db: AsyncSession, candidate: Candidate | None, rows) -> list[dict]:
+    """Turn union rows into response items, attaching match scores when a candidate is browsing."""
+    items = [_browse_item(row) for row in rows]
+    if not candidate:
+        return items
+    if candidate.embedding is not None:
+        for item, row in zip(items, rows):
+            if row.distance is not None:
+                distance = float(row.distance)
+                item["match_score"] = _fast_vector_score(distance)
                 item["match_reason"] = "Matched via semantic vector search."
-                item["suggested_for_you"] = True if float(distance) < 0.25 else False
+                item["suggested_for_you"] = distance < 0.25
             else:
                 item["match_score"] = 50
                 item["match_reason"] = "Semantic score unavailable."
                 item["suggested_for_you"] = False
-        results.append(item)
+        return items
 
-    if include_external:
-        loop = asyncio.get_event_loop()
-        try:
-            external = await loop.run_in_executor(None, get_external_jobs, sync_db, 20, q)
-        except Exception:
-            external = []
-            
-        cand_dict = _candidate_to_dict(candidate) if candidate else None
-        for ext in external:
-            if q and q.strip():
-                q_lower = q.strip().lower()
-                if q_lower not in (ext.get("title") or "").lower() and q_lower not in (ext.get("description") or "").lower():
-                    continue
-            if location and location.strip():
-                loc = (ext.get("location") or "").lower()
-                if location.strip().lower() not in loc:
-                    continue
-            item: dict = dict(ext)
-            if cand_dict:
-                match = compute_match_score(cand_dict, item)
-                item["match_score"] = match["score"]
-                item["match_reason"] = match["reason"]
-                item["suggested_for_you"] = match.get("suggested_for_you", False)
-            results.append(item)
-
-    if not results:
+    # No candidate vector: platform rows get a neutral score, external rows the cached/batched LLM score
+    external_items = []
+    for item, row in zip(items, rows):
+        if row.kind == "external":
+            external_items.append(item)
+        else:
+            item["match_score"] = 50
+            item["match_reason"] = "Semantic score unavailable."
+            item["suggested_for_you"] = False
+    if external_items:
+        matches = await get_match_scores_cached(async_db, _candidate_to_dict(candidate), external_items)
+        for item, match in zip(external_items, matches):
+            item["match_score"] = match["score"]
+            item["match_reason"] = match["reason"]
+            item["suggested_for_you"] = match.get("suggested_for_you", False)
+    return items
+
+
+def _row_cursor(row, mode: str, depth: int) -> str:
+    """Cursor for the page after `row`; `depth` counts every row served up to and including it."""
+    sort_key = row.sort_key if mode == "recent" else float(row.sort_key)
+    return encode_cursor(mode, sort_key, row.kind, row.id, depth)
+
+
+@router.get("/browse")
+async def browse_all_jobs(
+    response: Response,
+    candidate: Candidate | None = Depends(get_async_optional_candidate),
+    include_external: bool = Query(True),
+    q: str | None = Query(None, description="Full-text search in title/description (prefix-matched)"),
+    location: str | None = Query(None, description="Filter by location (contains)"),
+    remote: bool | None = Query(None, description="Filter by remote-only"),
+    salary_min: int | None = Query(None, ge=0, description="Only jobs whose salary range reaches this amount"),
+    salary_max: int | None = Query(None, ge=0, description="Only jobs whose salary range starts at or below this amount"),
+    ranking: BrowseRanking = Query("auto", description="semantic (embedding distance), lexical (text relevance) or recent"),
+    limit: int = Query(BROWSE_PAGE_DEFAULT, ge=1, le=BROWSE_PAGE_MAX, description="Page size"),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page's X-Next-Cursor"),
+    stream: bool = Query(False, description="Stream the page as NDJSON, one job per line"),
+    async_db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Browse all jobs (platform + external) asynchronously, one keyset page at a time.
+    By default ordered by semantic distance for candidates with an embedding, by text relevance when
+    searching, newest first otherwise; `ranking` selects the order explicitly.
+    The next page's cursor is returned in the X-Next-Cursor header (or as the last NDJSON line when streaming).
+    """
+    if include_external and not cursor:
+        # Popular searches are picked up by the background ingestion scheduler; never fetched inline
+        ingestion_scheduler.note_search(q)
+
+    tsquery = build_tsquery(q)
+    mode, rank_vector = await _resolve_ranking(ranking, candidate, tsquery, q)
+    after, depth = _decode_browse_cursor(cursor, mode)
+    union = _browse_union(
+        candidate, mode, rank_vector, q, location, remote, salary_min, salary_max, include_external,
+        after=after, limit=limit + 1,
+    )
+    stmt = _browse_page_stmt(union, mode, after, limit + 1)
+    # Each branch's index scan has to get past the rows of earlier pages before it reaches this one
+    ann_rows = depth + limit + 1
+
+    if stream:
+        return StreamingResponse(
+            _stream_browse(candidate, mode, stmt, limit, depth, ann_rows, first_page=cursor is None),
+            media_type="application/x-ndjson",
+        )
+
+    if mode == "semantic":
+        await apply_vector_search_settings(async_db, ann_rows)
+    rows = (await async_db.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        response.headers[NEXT_CURSOR_HEADER] = _row_cursor(rows[-1], mode, depth + len(rows))
+
+    results = await _score_browse_rows(async_db, candidate, rows)
+    if not results and cursor is None:
         results = [dict(j) for j in DEMO_JOBS]
-        # minimal filtering for demo
-        
+
     if candidate:
+        # Display order within the page; the cursor already follows the SQL order
         results.sort(key=lambda x: (x.get("suggested_for_you", False), x.get("match_score", 0)), reverse=True)
-        
+
     return results
+
+
+async def _stream_browse(
+    candidate: Candidate | None, mode: str, stmt, limit: int, depth: int, ann_rows: int, first_page: bool
+):
+    """NDJSON generator: emits jobs in SQL order as each chunk is scored, then a {"next_cursor": ...} line."""
+    # Own session: the request-scoped one may be closed before the body is streamed
+    async with AsyncSessionLocal() as db:
+        if mode == "semantic":
+            await apply_vector_search_settings(db, ann_rows)
+        emitted = 0
+        last_row = None
+        has_more = False
+        result = await db.stream(stmt)
+        async for chunk in result.partitions(BROWSE_STREAM_CHUNK):
+            rows = list(chunk)
+            if emitted + len(rows) > limit:
+                rows = rows[: limit - emitted]
+                has_more = True
+            # Scoring may write (and commit) match-cache rows; keep that off the session holding the cursor
+            async with AsyncSessionLocal() as score_db:
+                items = await _score_browse_rows(score_db, candidate, rows)
+            for item in items:
+                yield json.dumps(item, default=str) + "\n"
+            emitted += len(rows)
+            if rows:
+                last_row = rows[-1]
+            if has_more:
+                break
+        if emitted == 0 and first_page:
+            for job in DEMO_JOBS:
+                yield json.dumps(job) + "\n"
+        next_cursor = _row_cursor(last_row, mode, depth + emitted) if has_more and last_row is not None else None
+        yield json.dumps({"next_cursor": next_cursor}) + "\n"
@@ -0,0 +1,63 @@
+"""
+Admission control for expensive shared resources. A ReadGate caps how many callers use a resource at once
+and how many may queue behind them; beyond that, requests fail fast with 503 + Retry-After instead of
+piling up on the connection pool. Counters feed the status endpoints.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+
+class ReadGate:
+    def __init__(self, name: str, max_concurrent: int, max_waiting: int, retry_after: int = 1):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the gate's slots for the duration of the block; 503 when the queue is full."""
+        if self.in_flight >= self.max_concurrent and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.name} is busy, please retry",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self._wait_seconds += time.monotonic() - started
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(1000 * self._wait_seconds / self.completed, 2) if self.completed else 0.0,
+        }
@@ -44,10 +44,60 @@ class Settings(BaseSettings):
     ADZUNA_APP_ID: str | None = Field(default=None)
     ADZUNA_APP_KEY: str | None = Field(default=None)
 
+    # External job ingestion (background scheduler; request paths only read the external_jobs table)
+    EXTERNAL_INGEST_ENABLED: bool = Field(default=True, description="Run the background external-job refresh loop")
+    EXTERNAL_INGEST_INTERVAL_SECONDS: int = Field(default=1800, ge=60, description="Seconds between refresh cycles")
+    EXTERNAL_INGEST_QUERIES: str = Field(
+        default="software engineer,data engineer,frontend developer,product manager",
+        description="Queries refreshed every cycle, comma-separated",
+    )
+    EXTERNAL_INGEST_REGIONS: str = Field(default="us", description="Country codes refreshed every cycle, comma-separated")
+    EXTERNAL_INGEST_MAX_PAGES: int = Field(default=5, ge=1, description="Page budget per source per query/region refresh")
+    EXTERNAL_INGEST_POPULAR_QUERIES: int = Field(default=5, ge=0, description="Most-searched user queries added to each cycle")
+    EXTERNAL_JOB_RETENTION_DAYS: int = Field(default=30, ge=1, description="Delete external listings not fetched again for this many days")
+    EXTERNAL_JOB_EXPIRE_BATCH: int = Field(default=1000, ge=1, description="Rows deleted per transaction when expiring listings")
+
+    # Request-path external-job reads: admission control in front of the DB pool
+    EXTERNAL_READ_CONCURRENCY: int = Field(default=8, ge=1, description="External-job queries running at once")
+    EXTERNAL_READ_QUEUE: int = Field(default=32, ge=0, description="Reads allowed to wait for a slot; beyond this, 503")
+
+    # Resume uploads: parsed in the background by a pool of workers
+    RESUME_WORKERS: int = Field(default=4, ge=1, description="Resumes extracted and parsed at once per app process")
+    RESUME_JOB_STALE_SECONDS: int = Field(default=600, ge=30, description="A processing job older than this is assumed lost and claimed again")
+    RESUME_EXTRACT_PROCESSES: int = Field(default=2, ge=1, description="Processes extracting PDF/DOCX text")
+    RESUME_EXTRACT_CPU_SECONDS: int = Field(default=5, ge=1, description="CPU time one document may use in an extraction process")
+    RESUME_EXTRACT_TIMEOUT_SECONDS: float = Field(default=15, gt=0, description="Wall-clock limit on one document's extraction")
+    RESUME_MAX_PAGES: int = Field(default=10, ge=1, description="PDF pages read per resume")
+
+    # Upstream job APIs: local rate quota, retries and circuit breaker
+    ADZUNA_REQUESTS_PER_MINUTE: float = Field(default=25, gt=0, description="Adzuna calls per minute (token bucket)")
+    JSEARCH_REQUESTS_PER_MINUTE: float = Field(default=10, gt=0, description="JSearch (RapidAPI) calls per minute (token bucket)")
+    UPSTREAM_MAX_RETRIES: int = Field(default=2, ge=0, description="Retries on 429/5xx/transport errors, with jittered backoff")
+    UPSTREAM_BREAKER_THRESHOLD: int = Field(default=5, ge=1, description="Consecutive failures before a source is skipped")
+    UPSTREAM_BREAKER_COOLDOWN_SECONDS: float = Field(default=300, gt=0, description="How long a tripped source is skipped")
+
+    # Vector search (HNSW / IVFFlat): higher = better recall, slower queries
+    VECTOR_HNSW_EF_SEARCH: int = Field(default=40, ge=1, le=1000, description="hnsw.ef_search for nearest-neighbour queries")
+    VECTOR_IVFFLAT_PROBES: int = Field(default=10, ge=1, description="ivfflat.probes if an embedding index uses IVFFlat")
+    SIMILAR_JOBS_TTL_SECONDS: int = Field(default=3600, ge=60, description="Cached similar-jobs lists older than this are recomputed on read")
+
+    # LLM match scoring (external jobs)
+    MATCH_SCORE_BATCH_SIZE: int = Field(default=5, ge=1, description="Jobs packed into one scoring prompt")
+    MATCH_SCORE_CONCURRENCY: int = Field(default=4, ge=1, description="Max scoring prompts in flight per request")
+    MATCH_SCORE_DEADLINE_SECONDS: float = Field(default=8.0, gt=0, description="Per-request scoring budget; unfinished jobs get a neutral score")
+
     @property
     def frontend_origins(self) -> list[str]:
         return [o.strip() for o in self.FRONTEND_ORIGIN.split(",") if o.strip()]
 
+    @property
+    def external_ingest_queries(self) -> list[str]:
+        return [q.strip() for q in self.EXTERNAL_INGEST_QUERIES.split(",") if q.strip()]
+
+    @property
+    def external_ingest_regions(self) -> list[str]:
+        return [r.strip().lower() for r in self.EXTERNAL_INGEST_REGIONS.split(",") if r.strip()]
+
     @property
     def async_database_url(self) -> str:
         url = self.DATABASE_URL
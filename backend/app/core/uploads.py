@@ -0,0 +1,54 @@
+"""
+Chunked copying of multipart uploads to disk. Starlette already spools an UploadFile to a temporary file;
+handlers move it to its destination in fixed-size chunks, checking the file signature on the first chunk and
+the size as they go, so an upload is never held in memory whole and an oversized one stops at the limit.
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from fastapi import HTTPException, UploadFile
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# In-progress writes: outside the statically served uploads/ but on the same filesystem, so the final move is atomic
+UPLOAD_TMP_DIR = Path(__file__).resolve().parent.parent.parent / "storage" / "tmp"
+
+
+def save_upload(
+    file: UploadFile,
+    dest: Path,
+    *,
+    max_bytes: int,
+    check_head: Callable[[bytes], None],
+    too_large: str,
+) -> int:
+    """
+    Copy `file` to `dest` (blocking; call from a threadpool in async handlers). `check_head` receives the first
+    chunk (b"" for an empty file) and raises HTTPException to reject it. Writes go to a uniquely named file in
+    UPLOAD_TMP_DIR that replaces `dest` only once the whole file passed, so a rejected upload never clobbers an
+    existing one, concurrent uploads to the same `dest` do not share a file, and partial files are never served.
+    Returns bytes written.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    UPLOAD_TMP_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=UPLOAD_TMP_DIR, suffix=".part")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            chunk = file.file.read(UPLOAD_CHUNK_BYTES)
+            check_head(chunk)
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=400, detail=too_large)
+                out.write(chunk)
+                chunk = file.file.read(UPLOAD_CHUNK_BYTES)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return size
@@ -0,0 +1,48 @@
+"""
+Full-text search over job titles/descriptions. `jobs` and `external_jobs` carry a generated, GIN-indexed
+`search_vector` (title weighted A, description B); queries become prefix-matching tsqueries ranked by ts_rank_cd.
+"""
+import re
+
+from sqlalchemy import cast, func
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+
+SEARCH_CONFIG = "english"
+# Keep in sync with the generated column in the add_job_search_vector migration
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+MAX_QUERY_TERMS = 8
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def build_tsquery(q: str | None, *, match_any: bool = False) -> str | None:
+    """
+    Turn free text into a to_tsquery string with prefix matching ("data eng" -> "data:* & eng:*").
+    Only word characters survive, so user input can never inject tsquery operators. None if nothing is left.
+    """
+    if not q:
+        return None
+    terms = list(dict.fromkeys(t.lower() for t in _TERM.findall(q)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return (" | " if match_any else " & ").join(f"{t}:*" for t in terms)
+
+
+def ts_query(tsquery: str):
+    return func.to_tsquery(SEARCH_CONFIG, tsquery)
+
+
+def text_match(search_vector, tsquery: str):
+    """WHERE clause: row matches the query (served by the GIN index)."""
+    return search_vector.op("@@")(ts_query(tsquery))
+
+
+def text_rank(search_vector, tsquery: str):
+    """
+    Relevance for ORDER BY ... DESC. ts_rank_cd returns float4; cast to float8 so a rank that went through a
+    keyset cursor (a Python float) compares equal to the row it came from instead of skipping or repeating it.
+    """
+    return cast(func.ts_rank_cd(search_vector, ts_query(tsquery)), DOUBLE_PRECISION)
@@ -0,0 +1,36 @@
+"""
+Per-query pgvector index settings. The HNSW indexes on embedding columns trade recall for latency via
+hnsw.ef_search (ivfflat.probes if an index is switched to IVFFlat); both come from config and are set
+transaction-locally right before a nearest-neighbour query.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+_SET_SEARCH_PARAMS = text(
+    "SELECT set_config('hnsw.ef_search', :ef_search, true), set_config('ivfflat.probes', :probes, true)"
+)
+
+
+HNSW_MAX_EF_SEARCH = 1000  # pgvector rejects larger values
+
+
+def _params(limit: int) -> dict:
+    settings = get_settings()
+    # HNSW returns at most ef_search rows, so never let it drop below the requested rows (up to pgvector's cap)
+    return {
+        "ef_search": str(min(max(settings.VECTOR_HNSW_EF_SEARCH, limit), HNSW_MAX_EF_SEARCH)),
+        "probes": str(settings.VECTOR_IVFFLAT_PROBES),
+    }
+
+
+async def apply_vector_search_settings(db: AsyncSession, limit: int = 0) -> None:
+    """Set ANN search params for the current transaction (async session)."""
+    await db.execute(_SET_SEARCH_PARAMS, _params(limit))
+
+
+def apply_vector_search_settings_sync(db: Session, limit: int = 0) -> None:
+    """Set ANN search params for the current transaction (sync session)."""
+    db.execute(_SET_SEARCH_PARAMS, _params(limit))
@@ -14,6 +14,10 @@ from fastapi.staticfiles import StaticFiles
 
 from app.api import auth, jobs, employers, candidates, users, applications, matching, external_jobs, saved_jobs, webhooks, billing, messaging, assessments, interview, stats
 from app.core.config import get_settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.services.ingestion import ingestion_scheduler
+from app.services.job_aggregator import close_http_client
+from app.services.resume_ingest import resume_ingestor
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.upload_limit import LimitUploadSizeMiddleware
@@ -35,6 +39,7 @@ def http_exception_handler(_request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content=error_response("http_error", msg, details),
+        headers=getattr(exc, "headers", None),  # e.g. Retry-After on 503
     )
 
 
@@ -103,6 +108,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -110,6 +116,24 @@ app.add_middleware(
 def _startup_validate() -> None:
     _validate_critical_config()
 
+
+@app.on_event("startup")
+async def _start_ingestion() -> None:
+    if _settings.EXTERNAL_INGEST_ENABLED:
+        ingestion_scheduler.start()
+
+
+@app.on_event("startup")
+async def _start_resume_workers() -> None:
+    resume_ingestor.start()
+
+
+@app.on_event("shutdown")
+async def _shutdown_http_client() -> None:
+    await ingestion_scheduler.stop()
+    await resume_ingestor.stop()
+    await close_http_client()
+
 app.include_router(auth.router)
 app.include_router(jobs.router)
 app.include_router(employers.router)
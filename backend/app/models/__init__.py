@@ -4,6 +4,8 @@ from .employer import Employer
 from .job import Job
 from .application import Application
 from .external_job import ExternalJob
+from .external_job_payload import ExternalJobPayload
+from .external_job_sync_state import ExternalJobSyncState
 from .saved_job import SavedJob
 from .match import Match
 from .employer_note import EmployerNote
@@ -13,3 +15,5 @@ from .usage_counter import UsageCounter
 from .audit_log import AuditLog
 from .conversation import Conversation, Message
 from .assessment import Assessment, AssessmentResult
+from .resume_job import ResumeJob
+from .parsed_resume import ParsedResume
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, Integer, DateTime, Text
+from sqlalchemy import Column, Index, String, ForeignKey, Integer, DateTime, Text
 from sqlalchemy.dialects.postgresql import UUID, JSON, JSONB
 from pgvector.sqlalchemy import Vector
 from app.db.base import Base
@@ -8,6 +8,15 @@ from app.db.base import Base
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        Index(
+            "ix_candidates_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
@@ -31,5 +40,6 @@ class Candidate(Base):
     resume_text = Column(Text, nullable=True)
     resume_parsed_data = Column(JSON, nullable=True)  # parsed_profile
     embedding = Column(Vector(1536), nullable=True)  # OpenAI text-embedding-3-small
+    embedding_model = Column(String, nullable=True)  # model that produced `embedding`; mismatch => re-embed
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
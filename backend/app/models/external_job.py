@@ -1,13 +1,35 @@
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy import Boolean, Column, Integer, Computed, ForeignKey, Index, String, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from pgvector.sqlalchemy import Vector
 import uuid
 from datetime import datetime
 from app.db.base import Base
+from app.db.text_search import SEARCH_VECTOR_SQL
 
 
 class ExternalJob(Base):
     """Aggregated jobs from external APIs (Adzuna, etc.)"""
     __tablename__ = "external_jobs"
+    __table_args__ = (
+        UniqueConstraint("source", "external_id", name="uq_external_jobs_source_external_id"),
+        Index(
+            "ix_external_jobs_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        Index("ix_external_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_external_jobs_fingerprint", "fingerprint"),
+        Index("ix_external_jobs_canonical_id", "canonical_id"),
+        Index("ix_external_jobs_fetched_at", "fetched_at"),
+        Index(
+            "ix_external_jobs_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     external_id = Column(String, index=True)  # ID from source
@@ -19,5 +41,15 @@ class ExternalJob(Base):
     url = Column(String, nullable=True)
     salary_min = Column(String, nullable=True)
     salary_max = Column(String, nullable=True)
-    raw_data = Column(JSON, nullable=True)
-    fetched_at = Column(DateTime, default=datetime.utcnow)
+    salary_min_value = Column(Integer, nullable=True)  # numeric salary_min, for range filters
+    salary_max_value = Column(Integer, nullable=True)
+    remote = Column(Boolean, nullable=True)  # source flag (JSearch) or "remote" in title/location
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the listing fields; change => re-embed
+    fingerprint = Column(String(64), nullable=True)  # normalized title + company + city; cross-source dedup block
+    # NULL = canonical (served); otherwise the listing this one duplicates
+    canonical_id = Column(UUID(as_uuid=True), ForeignKey("external_jobs.id", ondelete="SET NULL"), nullable=True)
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))  # full-text search (GIN)
+    embedding = Column(Vector(1536), nullable=True)  # filled after ingest by the ingestion scheduler
+    embedding_model = Column(String, nullable=True)  # model that produced `embedding`; mismatch => re-embed
+    posted_at = Column(DateTime, nullable=True)  # when the source says the job was posted (UTC)
+    fetched_at = Column(DateTime, default=datetime.utcnow)  # last time a source delivered it; drives expiry
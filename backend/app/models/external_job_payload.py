@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.db.base import Base
+
+
+class ExternalJobPayload(Base):
+    """Raw source payload of an external listing, kept out of the hot external_jobs table."""
+    __tablename__ = "external_job_payloads"
+
+    external_job_id = Column(
+        UUID(as_uuid=True), ForeignKey("external_jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    raw_data = Column(JSONB, nullable=True)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, PrimaryKeyConstraint, String
+
+from app.db.base import Base
+
+
+class ExternalJobSyncState(Base):
+    """Per source/query/region crawl progress: the newest posting seen, so later runs only fetch newer ones."""
+    __tablename__ = "external_job_sync_state"
+    __table_args__ = (PrimaryKeyConstraint("source", "query", "region", name="pk_external_job_sync_state"),)
+
+    source = Column(String, nullable=False)  # adzuna, jsearch
+    query = Column(String, nullable=False)
+    region = Column(String, nullable=False)
+    high_water_mark = Column(DateTime, nullable=True)  # max posted_at stored so far
+    last_run_at = Column(DateTime, default=datetime.utcnow)
+    last_pages = Column(Integer, nullable=True)  # pages fetched by the last run
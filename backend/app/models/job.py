@@ -1,13 +1,27 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID, JSON, JSONB
+from sqlalchemy import Column, Computed, Index, String, Boolean, Integer, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID, JSON, JSONB
 from pgvector.sqlalchemy import Vector
 from app.db.base import Base
+from app.db.text_search import SEARCH_VECTOR_SQL
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index(
+            "ix_jobs_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_jobs_location_trgm", "location", postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}),
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_employer_created_at_id", "employer_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     employer_id = Column(UUID(as_uuid=True), ForeignKey("employers.id"), nullable=False)
@@ -21,6 +35,10 @@ class Job(Base):
     salary_min = Column(Integer, nullable=True)
     salary_max = Column(Integer, nullable=True)
     status = Column(String, nullable=True, default="open")  # open, closed
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))  # full-text search (GIN)
     embedding = Column(Vector(1536), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    embedding_model = Column(String, nullable=True)  # model that produced `embedding`; mismatch => re-embed
+    similar_job_ids = Column(JSONB, nullable=True)  # cached nearest neighbours by embedding; NULL = not computed
+    similar_computed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,20 +1,27 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from app.db.base import Base
 
 
 class Match(Base):
-    """AI match score + explanation for job-candidate pair. Never uses protected attributes."""
+    """AI match score + explanation for job-candidate pair. Never uses protected attributes.
+    Either job_id (platform job) or external_job_id (aggregated listing) is set.
+    content_hash covers the candidate profile and job text the score was computed from; a mismatch means stale."""
     __tablename__ = "matches"
-    __table_args__ = (UniqueConstraint("job_id", "candidate_id", name="uq_match_job_candidate"),)
+    __table_args__ = (
+        UniqueConstraint("job_id", "candidate_id", name="uq_match_job_candidate"),
+        UniqueConstraint("candidate_id", "external_job_id", name="uq_match_candidate_external_job"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=True)
+    external_job_id = Column(UUID(as_uuid=True), ForeignKey("external_jobs.id", ondelete="CASCADE"), nullable=True)
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
     score = Column(Integer, nullable=False)  # 0–100
     explanation = Column(JSONB, nullable=True)  # bullets, gaps, etc.
+    content_hash = Column(String(64), nullable=True)  # sha256 of candidate + job inputs
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.base import Base
+
+
+class ParsedResume(Base):
+    """Parser output for one exact resume text, keyed by content hash (text + parser version), shared across uploads."""
+    __tablename__ = "parsed_resumes"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256 of parser version + extracted text
+    parsed = Column(JSONB, nullable=False)
+    warnings = Column(JSONB, nullable=True)
+    ai_used = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)  # last upload served from this row
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.db.base import Base
+
+
+class ResumeJob(Base):
+    """One uploaded resume waiting for, or done with, background extraction and parsing."""
+    __tablename__ = "resume_jobs"
+    __table_args__ = (Index("ix_resume_jobs_status_created_at", "status", "created_at"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    candidate_id = Column(
+        UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status = Column(String, nullable=False, default="queued")  # queued, processing, done, failed
+    filename = Column(String, nullable=False)  # as uploaded; its extension picks the extractor
+    file_path = Column(String, nullable=True)  # stored upload; removed once the job finishes
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+    result = Column(JSONB, nullable=True)  # {"parsed": ..., "warnings": [...], "ai_used": bool}
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
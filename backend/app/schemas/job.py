@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Any
 from uuid import UUID
+from datetime import datetime
 
 
 class JobCreate(BaseModel):
@@ -30,3 +31,19 @@ class JobResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class JobListItem(BaseModel):
+    """List row; only the fields requested via ?fields= are set (serialize with exclude_unset)."""
+    id: UUID | None = None
+    employer_id: UUID | None = None
+    title: str | None = None
+    description: str | None = None
+    requirements: dict | None = None
+    location: str | None = None
+    remote: bool | None = None
+    created_at: datetime | None = None
+    applicant_count: int | None = None  # /jobs/mine only
+
+    class Config:
+        from_attributes = True
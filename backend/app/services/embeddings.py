@@ -0,0 +1,261 @@
+"""
+Batched embedding generation. One pooled AsyncOpenAI client, multi-input requests sized to stay under the
+API's per-request limits, and one bulk UPDATE per batch of rows instead of a request + transaction per row.
+"""
+import asyncio
+import logging
+import os
+from functools import lru_cache
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import Candidate, Employer, ExternalJob, Job
+from app.services.similar_jobs import refresh_similar_jobs
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 1536  # width of every embedding column
+MAX_TEXT_CHARS = 8000
+# OpenAI allows 2048 inputs / ~300k tokens per embeddings request; stay well inside both.
+MAX_INPUTS_PER_REQUEST = 512
+MAX_TOKENS_PER_REQUEST = 200_000
+
+
+def get_candidate_text(c) -> str:
+    """Convert a candidate model to text for embedding."""
+    skills = c.skills if isinstance(c.skills, list) else []
+    exp = c.experience if isinstance(c.experience, list) else []
+    exp_text = "; ".join([f"{e.get('title', '')} at {e.get('company', '')}" for e in exp if isinstance(e, dict)])
+    parts = [
+        f"Role: {c.headline or c.full_name}",
+        f"Skills: {', '.join(str(s) for s in skills)}",
+        f"Experience: {exp_text}",
+        f"Summary: {c.summary or ''}"
+    ]
+    return " ".join(parts)[:MAX_TEXT_CHARS]
+
+
+def get_job_text(j) -> str:
+    """Convert a job model, row or dict to text for embedding."""
+    if isinstance(j, dict):
+        title = j.get("title") or ""
+        company = j.get("company") or ""
+        desc = j.get("description") or ""
+    else:
+        title = getattr(j, "title", "") or ""
+        if isinstance(getattr(j, "company", None), str):
+            company = j.company
+        else:
+            company = getattr(j.employer, "company_name", "") if getattr(j, "employer", None) else ""
+        desc = getattr(j, "description", "") or ""
+    return f"Job Title: {title}. Company: {company}. Description: {desc}"[:MAX_TEXT_CHARS]
+
+
+@lru_cache(maxsize=1)
+def get_embedding_client():
+    """Process-wide client so every batch reuses the same HTTP connection pool."""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def _approx_tokens(text: str) -> int:
+    # Conservative (~3 chars/token) so a batch never trips the request token cap
+    return len(text) // 3 + 1
+
+
+def _request_batches(indexed: list[tuple[int, str]]) -> list[list[tuple[int, str]]]:
+    """Split (index, text) pairs into request-sized groups by input count and estimated tokens."""
+    batches: list[list[tuple[int, str]]] = []
+    current: list[tuple[int, str]] = []
+    tokens = 0
+    for item in indexed:
+        cost = _approx_tokens(item[1])
+        if current and (len(current) >= MAX_INPUTS_PER_REQUEST or tokens + cost > MAX_TOKENS_PER_REQUEST):
+            batches.append(current)
+            current, tokens = [], 0
+        current.append(item)
+        tokens += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _dimension_kwargs(model: str) -> dict:
+    # text-embedding-3-* can be shortened to the column width, which lets OPENAI_EMBEDDING_MODEL switch
+    # (e.g. to -large) without a schema change; older models are fixed at 1536.
+    return {"dimensions": EMBEDDING_DIM} if model.startswith("text-embedding-3") else {}
+
+
+async def generate_embeddings(
+    texts: list[str],
+    model: str | None = None,
+    *,
+    throttle: Callable[[], Awaitable[None]] | None = None,
+) -> list[list[float] | None]:
+    """
+    Embed many texts with as few requests as possible. Returns one vector per input, in order;
+    blank inputs and inputs from a failed request get None. `throttle` is awaited before each request.
+    """
+    results: list[list[float] | None] = [None] * len(texts)
+    if not os.getenv("OPENAI_API_KEY"):
+        return results
+    model = model or get_settings().OPENAI_EMBEDDING_MODEL
+    indexed = [(i, t[:MAX_TEXT_CHARS]) for i, t in enumerate(texts) if t and t.strip()]
+    client = get_embedding_client()
+    for batch in _request_batches(indexed):
+        if throttle is not None:
+            await throttle()
+        try:
+            response = await client.embeddings.create(
+                input=[t for _, t in batch], model=model, **_dimension_kwargs(model)
+            )
+        except Exception as e:
+            logger.warning("Embedding request failed for %d inputs: %s", len(batch), type(e).__name__)
+            continue
+        for item in response.data:
+            results[batch[item.index][0]] = item.embedding
+    return results
+
+
+# kind -> ORM model whose `embedding` column is written back
+EMBEDDABLE = {
+    "candidate": Candidate,
+    "job": Job,
+    "external_job": ExternalJob,
+}
+
+
+def embedding_scope(kind: str) -> tuple:
+    """Extra WHERE clauses for rows worth embedding: duplicate external listings are never served."""
+    return (ExternalJob.canonical_id == None,) if kind == "external_job" else ()
+
+
+async def _load_texts(db: AsyncSession, kind: str, ids: list[UUID]) -> list[tuple[UUID, str]]:
+    if kind == "candidate":
+        result = await db.execute(select(Candidate).where(Candidate.id.in_(ids)))
+        return [(c.id, get_candidate_text(c)) for c in result.scalars().all()]
+    if kind == "job":
+        result = await db.execute(
+            select(Job.id, Job.title, Job.description, Employer.company_name.label("company"))
+            .outerjoin(Employer, Employer.id == Job.employer_id)
+            .where(Job.id.in_(ids))
+        )
+        return [(r.id, get_job_text(dict(r._mapping))) for r in result.all()]
+    if kind == "external_job":
+        result = await db.execute(
+            select(ExternalJob.id, ExternalJob.title, ExternalJob.company, ExternalJob.description)
+            .where(ExternalJob.id.in_(ids))
+        )
+        return [(r.id, get_job_text(dict(r._mapping))) for r in result.all()]
+    raise ValueError(f"Unknown embedding kind: {kind}")
+
+
+async def embed_rows(kind: str, ids, *, throttle: Callable[[], Awaitable[None]] | None = None) -> int:
+    """Embed the given rows in bulk and write all vectors back in one UPDATE. Returns rows updated."""
+    ids = [UUID(str(i)) for i in ids]
+    if not ids:
+        return 0
+    model_cls = EMBEDDABLE[kind]
+    model = get_settings().OPENAI_EMBEDDING_MODEL
+    async with AsyncSessionLocal() as db:
+        rows = await _load_texts(db, kind, ids)
+        embeddings = await generate_embeddings([text for _, text in rows], model=model, throttle=throttle)
+        params = [
+            {"id": row_id, "embedding": emb, "embedding_model": model}
+            for (row_id, _), emb in zip(rows, embeddings)
+            if emb
+        ]
+        if not params:
+            return 0
+        await db.execute(update(model_cls), params)
+        await db.commit()
+        if kind == "job":
+            # New vectors move these jobs' neighbourhoods; keep their cached similar-jobs lists in step
+            try:
+                await refresh_similar_jobs(db, [p["id"] for p in params])
+            except Exception as e:
+                logger.warning("Similar-jobs refresh failed for %d jobs: %s", len(params), type(e).__name__)
+        return len(params)
+
+
+async def embed_pending(kind: str, limit: int = 500) -> int:
+    """Embed up to `limit` rows of `kind` that have no embedding yet."""
+    model_cls = EMBEDDABLE[kind]
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(model_cls.id).where(model_cls.embedding == None, *embedding_scope(kind)).limit(limit)
+        )
+        ids = [r[0] for r in result.all()]
+    return await embed_rows(kind, ids)
+
+
+async def embed_all_pending(kind: str, batch_size: int = 500) -> int:
+    """
+    Embed every row of `kind` that has no embedding yet, `batch_size` rows at a time in id order (keyset, so
+    rows that fail to embed are not fetched again). Stops at the first batch that embeds nothing, e.g. while
+    the embeddings API is down; the next run picks up the rest. Returns rows embedded.
+    """
+    model_cls = EMBEDDABLE[kind]
+    total, after = 0, None
+    while True:
+        stmt = select(model_cls.id).where(model_cls.embedding == None, *embedding_scope(kind))
+        if after is not None:
+            stmt = stmt.where(model_cls.id > after)
+        async with AsyncSessionLocal() as db:
+            ids = list((await db.execute(stmt.order_by(model_cls.id).limit(batch_size))).scalars().all())
+        if not ids:
+            return total
+        embedded = await embed_rows(kind, ids)
+        if not embedded:
+            return total
+        total += embedded
+        after = ids[-1]
+
+
+class EmbeddingBatcher:
+    """
+    Collects row ids from background tasks and flushes them together: a burst of job edits or imports
+    becomes one embeddings request and one bulk UPDATE per kind instead of one of each per row.
+    """
+
+    def __init__(self, max_batch: int = MAX_INPUTS_PER_REQUEST, max_delay: float = 0.5):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: dict[str, set[UUID]] = {kind: set() for kind in EMBEDDABLE}
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def _pending_count(self) -> int:
+        return sum(len(ids) for ids in self._pending.values())
+
+    async def submit(self, kind: str, row_id) -> None:
+        """Queue a row for embedding; returns immediately unless the batch is full."""
+        self._pending[kind].add(UUID(str(row_id)))
+        if self._pending_count() >= self.max_batch:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            pending, self._pending = self._pending, {kind: set() for kind in EMBEDDABLE}
+            for kind, ids in pending.items():
+                if not ids:
+                    continue
+                try:
+                    await embed_rows(kind, ids)
+                except Exception as e:
+                    logger.warning("Embedding flush failed for %d %s rows: %s", len(ids), kind, type(e).__name__)
+
+
+embedding_batcher = EmbeddingBatcher()
@@ -0,0 +1,204 @@
+"""
+Background ingestion of external jobs. A scheduler started with the app refreshes the configured queries
+and regions, plus the queries users search most, on a fixed interval. Concurrent refreshes of the same
+(query, region) are collapsed into one (single-flight, in-process and across workers via a Postgres
+advisory lock), so request handlers never wait on a third-party API: they read external_jobs and at most
+nudge a refresh for the next visitor. After each cycle, listings no source has delivered for
+EXTERNAL_JOB_RETENTION_DAYS are deleted in batches.
+"""
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, text
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models import ExternalJob
+from app.services.embeddings import embed_all_pending
+from app.services.job_aggregator import fetch_all_sources
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_CHARS = 100
+MAX_TRACKED_QUERIES = 1000  # distinct user queries counted between cycles; least recently searched dropped first
+MAX_ON_DEMAND_REFRESHES = 20  # request-triggered refreshes running at once; least recently requested cancelled first
+
+_TRY_LOCK = text("SELECT pg_try_advisory_lock(hashtext(:key))")
+_UNLOCK = text("SELECT pg_advisory_unlock(hashtext(:key))")
+
+
+def normalize_query(q: str | None) -> str | None:
+    q = " ".join((q or "").lower().split())[:MAX_QUERY_CHARS]
+    return q or None
+
+
+async def expire_stale_external_jobs(older_than_days: int | None = None, batch_size: int | None = None) -> int:
+    """
+    Delete listings no source has delivered for `older_than_days`, oldest first, `batch_size` rows per
+    transaction so locks stay short and autovacuum can keep up. Payloads and cached match scores go with them.
+    Returns rows deleted.
+    """
+    settings = get_settings()
+    days = older_than_days or settings.EXTERNAL_JOB_RETENTION_DAYS
+    batch_size = batch_size or settings.EXTERNAL_JOB_EXPIRE_BATCH
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    deleted = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            stale = (
+                select(ExternalJob.id)
+                .where(ExternalJob.fetched_at < cutoff)
+                .order_by(ExternalJob.fetched_at)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(ExternalJob).where(ExternalJob.id.in_(stale)))
+            await db.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return deleted
+        await asyncio.sleep(0)  # let request handlers in between batches
+
+
+class IngestionScheduler:
+    """Periodic, single-flight refresh of external job listings."""
+
+    def __init__(self):
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._on_demand: OrderedDict[tuple[str, str], asyncio.Task] = OrderedDict()
+        self._searches: OrderedDict[str, int] = OrderedDict()
+        self._loop_task: asyncio.Task | None = None
+
+    def note_search(self, q: str | None) -> None:
+        """Count a user search so popular queries join the next refresh cycle."""
+        q = normalize_query(q)
+        if not q:
+            return
+        self._searches[q] = self._searches.pop(q, 0) + 1
+        if len(self._searches) > MAX_TRACKED_QUERIES:
+            self._searches.popitem(last=False)
+
+    def refresh(self, query: str, region: str = "us", *, embed: bool = True) -> asyncio.Task:
+        """
+        Start (or join) a refresh of one (query, region); never blocks the caller. With `embed`, new
+        listings are embedded as soon as they land (run_cycle embeds once for the whole cycle instead).
+        """
+        key = (normalize_query(query) or "software engineer", region)
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(*key, embed=embed))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    def request_refresh(self, query: str, region: str = "us") -> asyncio.Task:
+        """
+        Refresh asked for by a request. Joins a running refresh of the same key; otherwise at most
+        MAX_ON_DEMAND_REFRESHES run at once and the least recently requested one is cancelled to make room
+        (pages it already stored stay committed).
+        """
+        key = (normalize_query(query) or "software engineer", region)
+        joined = self._inflight.get(key)
+        if joined is not None and not joined.done():
+            if key in self._on_demand:
+                self._on_demand.move_to_end(key)
+            return joined
+        while len(self._on_demand) >= MAX_ON_DEMAND_REFRESHES:
+            _, oldest = self._on_demand.popitem(last=False)
+            oldest.cancel()
+        task = self.refresh(*key)
+        self._on_demand[key] = task
+        task.add_done_callback(lambda t: self._forget_on_demand(key, t))
+        return task
+
+    def _forget(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def _forget_on_demand(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._on_demand.get(key) is task:
+            del self._on_demand[key]
+
+    async def _refresh(self, query: str, region: str, *, embed: bool) -> int:
+        """Returns how many listings were inserted or changed."""
+        lock_key = {"key": f"external_jobs:{region}:{query}"}
+        # Session-level lock on a connection of its own: the crawl commits page by page on other sessions,
+        # so no transaction stays open for the length of the crawl
+        async with async_engine.connect() as lock_conn:
+            got_lock = (await lock_conn.execute(_TRY_LOCK, lock_key)).scalar()
+            await lock_conn.commit()
+            if not got_lock:
+                return 0  # another worker is already refreshing this key: let it finish the job
+            try:
+                stats = await fetch_all_sources(
+                    query=query, country=region, max_pages=get_settings().EXTERNAL_INGEST_MAX_PAGES
+                )
+            except Exception as e:
+                logger.warning("External job refresh failed for %r/%s: %s", query, region, type(e).__name__)
+                return 0
+            finally:
+                try:
+                    await lock_conn.execute(_UNLOCK, lock_key)
+                    await lock_conn.commit()
+                except BaseException:
+                    # Back in the pool the connection would keep holding the lock; dropping it releases it
+                    await lock_conn.invalidate()
+                    raise
+        changed = stats["inserted"] + stats["updated"]
+        if changed and embed:
+            await embed_all_pending("external_job")
+        return changed
+
+    def _cycle_queries(self) -> list[str]:
+        settings = get_settings()
+        popular = [q for q, _ in Counter(self._searches).most_common(settings.EXTERNAL_INGEST_POPULAR_QUERIES)]
+        self._searches.clear()
+        return list(dict.fromkeys([*map(normalize_query, settings.external_ingest_queries), *popular]))
+
+    async def run_cycle(self) -> int:
+        """Refresh every scheduled (query, region) concurrently, then embed new and changed listings."""
+        settings = get_settings()
+        tasks = [self.refresh(q, r, embed=False) for q in self._cycle_queries() for r in settings.external_ingest_regions]
+        changed = sum(n for n in await asyncio.gather(*tasks, return_exceptions=True) if isinstance(n, int))
+        if changed:
+            await embed_all_pending("external_job")
+        return changed
+
+    async def _run(self) -> None:
+        interval = get_settings().EXTERNAL_INGEST_INTERVAL_SECONDS
+        while True:
+            try:
+                changed = await self.run_cycle()
+                logger.info("External job refresh cycle done: %d listings new or changed", changed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("External job refresh cycle failed: %s", type(e).__name__)
+            try:
+                expired = await expire_stale_external_jobs()
+                if expired:
+                    logger.info("Expired %d external listings not seen recently", expired)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("External job expiry failed: %s", type(e).__name__)
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [t for t in [self._loop_task, *self._inflight.values()] if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._inflight.clear()
+        self._on_demand.clear()
+
+
+ingestion_scheduler = IngestionScheduler()
@@ -1,161 +1,505 @@
 """
 Job aggregation from Adzuna and JSearch (LinkedIn, Indeed, Glassdoor, ZipRecruiter via Google for Jobs).
+Sources are crawled concurrently over one pooled, keep-alive HTTP/2 client, each under its own timeout,
+so a refresh costs the slowest source rather than the sum. Every call goes through the source's guard
+(rate quota, retry with jitter, circuit breaker; see upstream.py). Fetchers only talk to the network and return one
+page; crawl_source walks pages newest-first from a stored high-water mark and bulk-upserts each one.
 """
+import asyncio
+import logging
 import os
 import hashlib
+import json
+import re
 import httpx
-from datetime import datetime
-from app.models import ExternalJob
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from app.core.concurrency import ReadGate
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.db.text_search import build_tsquery, text_match, text_rank
+from app.models import ExternalJob, ExternalJobPayload, ExternalJobSyncState
+from app.services.job_dedup import job_fingerprint, link_duplicates
+from app.services.upstream import UpstreamError, source_guard
+from sqlalchemy import Boolean, String, and_, case, func, literal_column, null
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+logger = logging.getLogger(__name__)
+
+# Per-source budgets: connect fast, then give slow upstreams a bounded read window
+SOURCE_TIMEOUTS = {
+    "adzuna": httpx.Timeout(10.0, connect=3.0),
+    "jsearch": httpx.Timeout(15.0, connect=3.0),
+}
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide client so every refresh reuses pooled keep-alive (HTTP/2) connections to the sources."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(15.0, connect=3.0),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _parse_posted_at(value) -> datetime | None:
+    """Source posting time (ISO string or epoch seconds) as naive UTC, like the rest of our timestamps."""
+    if not value:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+_REMOTE = re.compile(r"\bremote\b", re.IGNORECASE)
+
+
+def _mentions_remote(*texts) -> bool:
+    """Adzuna has no remote flag; listings advertise it in the title or location."""
+    return any(_REMOTE.search(t) for t in texts if isinstance(t, str))
+
 
 # --- Adzuna ---
 ADZUNA_BASE = "https://api.adzuna.com/v1/api/jobs"
 REGIONS = {"gb": "United Kingdom", "us": "United States"}
 
 
-def fetch_adzuna_jobs(db: Session, region: str = "us", results_per_page: int = 20) -> list[dict]:
-    """Fetch jobs from Adzuna API. Requires ADZUNA_APP_ID and ADZUNA_APP_KEY."""
+def _adzuna_job(item: dict) -> dict:
+    job = {
+        "external_id": f"adzuna_{item.get('id', '')}",
+        "source": "adzuna",
+        "title": item.get("title", ""),
+        "company": item.get("company", {}).get("display_name") if isinstance(item.get("company"), dict) else str(item.get("company", "")),
+        "location": item.get("location", {}).get("display_name") if isinstance(item.get("location"), dict) else str(item.get("location", "")),
+        "description": item.get("description", ""),
+        "url": item.get("redirect_url"),
+        "salary_min": str(item.get("salary_min", "")) if item.get("salary_min") else None,
+        "salary_max": str(item.get("salary_max", "")) if item.get("salary_max") else None,
+        "salary_min_value": salary_amount(item.get("salary_min")),
+        "salary_max_value": salary_amount(item.get("salary_max")),
+        "raw_data": item,
+        "posted_at": _parse_posted_at(item.get("created")),
+    }
+    job["remote"] = _mentions_remote(job["title"], job["location"])
+    return job
+
+
+async def fetch_adzuna_jobs(
+    query: str | None = None,
+    region: str = "us",
+    page: int = 1,
+    results_per_page: int = 50,
+    since: datetime | None = None,
+) -> list[dict]:
+    """
+    Fetch one page of jobs from Adzuna API, newest first. Requires ADZUNA_APP_ID and ADZUNA_APP_KEY.
+    `since` narrows the search to postings from the last few days (Adzuna filters by whole days).
+    """
     app_id = os.getenv("ADZUNA_APP_ID")
     app_key = os.getenv("ADZUNA_APP_KEY")
     if not app_id or not app_key:
         return []
 
-    jobs = []
-    try:
-        resp = httpx.get(
-            f"{ADZUNA_BASE}/{region}/search/1",
-            params={
-                "app_id": app_id,
-                "app_key": app_key,
-                "results_per_page": results_per_page,
-            },
-            timeout=15,
+    params = {
+        "app_id": app_id,
+        "app_key": app_key,
+        "results_per_page": results_per_page,
+        "sort_by": "date",
+    }
+    if query:
+        params["what"] = query
+    if since is not None:
+        params["max_days_old"] = max(1, (datetime.utcnow() - since).days + 1)
+    resp = await source_guard("adzuna").request(
+        lambda: get_http_client().get(
+            f"{ADZUNA_BASE}/{region}/search/{page}",
+            params=params,
+            timeout=SOURCE_TIMEOUTS["adzuna"],
         )
-        if resp.status_code != 200:
-            return []
-        data = resp.json()
-        for item in data.get("results", []):
-            job = {
-                "external_id": f"adzuna_{item.get('id', '')}",
-                "source": "adzuna",
-                "title": item.get("title", ""),
-                "company": item.get("company", {}).get("display_name") if isinstance(item.get("company"), dict) else str(item.get("company", "")),
-                "location": item.get("location", {}).get("display_name") if isinstance(item.get("location"), dict) else str(item.get("location", "")),
-                "description": item.get("description", ""),
-                "url": item.get("redirect_url"),
-                "salary_min": str(item.get("salary_min", "")) if item.get("salary_min") else None,
-                "salary_max": str(item.get("salary_max", "")) if item.get("salary_max") else None,
-                "raw_data": item,
-            }
-            jobs.append(job)
-            _upsert_external_job(db, job)
-        db.commit()
-    except Exception:
-        pass
-    return jobs
+    )
+    return [_adzuna_job(item) for item in resp.json().get("results", [])]
 
 
 # --- JSearch (LinkedIn, Indeed, Glassdoor, ZipRecruiter via Google for Jobs) ---
 JSEARCH_BASE = "https://jsearch.p.rapidapi.com"
 
 
-def fetch_jsearch_jobs(db: Session, query: str = "software engineer", num_pages: int = 1, country: str = "us") -> list[dict]:
+def _jsearch_job(item: dict) -> dict:
+    job_id = item.get("job_id") or item.get("job_uuid") or ""
+    raw = str(job_id) if job_id else str(item)
+    ext_id = f"jsearch_{hashlib.md5(raw.encode(errors='ignore')).hexdigest()[:24]}"
+    emp = item.get("employer")
+    employer = item.get("employer_name") or (emp.get("name") if isinstance(emp, dict) else str(emp or ""))
+    job = {
+        "external_id": ext_id,
+        "source": "jsearch",
+        "title": item.get("job_title", ""),
+        "company": employer,
+        "location": item.get("job_city") or item.get("job_country") or (item.get("job_location") or {}).get("display_name") if isinstance(item.get("job_location"), dict) else "",
+        "description": item.get("job_description", "")[:5000] if item.get("job_description") else "",
+        "url": item.get("job_apply_link") or item.get("job_google_link"),
+        "salary_min": str(item.get("job_min_salary", "")) if item.get("job_min_salary") else None,
+        "salary_max": str(item.get("job_max_salary", "")) if item.get("job_max_salary") else None,
+        "salary_min_value": salary_amount(item.get("job_min_salary")),
+        "salary_max_value": salary_amount(item.get("job_max_salary")),
+        "remote": bool(item.get("job_is_remote")) or _mentions_remote(item.get("job_title")),
+        "raw_data": {k: v for k, v in item.items() if k not in ("job_description",)},
+        "posted_at": _parse_posted_at(item.get("job_posted_at_datetime_utc") or item.get("job_posted_at_timestamp")),
+    }
+    if not job["location"] and isinstance(item.get("job_location"), dict):
+        job["location"] = item["job_location"].get("display_name", "")
+    return job
+
+
+def _jsearch_date_posted(since: datetime | None) -> str:
+    """Narrowest JSearch date_posted bucket that still covers everything after `since`."""
+    if since is None:
+        return "all"
+    age = datetime.utcnow() - since
+    for bucket, days in (("today", 1), ("3days", 3), ("week", 7), ("month", 30)):
+        if age < timedelta(days=days):
+            return bucket
+    return "all"
+
+
+async def fetch_jsearch_jobs(
+    query: str = "software engineer",
+    page: int = 1,
+    num_pages: int = 1,
+    country: str = "us",
+    since: datetime | None = None,
+) -> list[dict]:
     """
-    Fetch jobs from JSearch API. Aggregates LinkedIn, Indeed, Glassdoor, ZipRecruiter, Monster.
+    Fetch one page of jobs from JSearch API. Aggregates LinkedIn, Indeed, Glassdoor, ZipRecruiter, Monster.
     Requires RAPIDAPI_KEY. Subscribe at https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch
     """
     api_key = os.getenv("RAPIDAPI_KEY") or os.getenv("X_RAPIDAPI_KEY")
     if not api_key:
         return []
 
-    jobs = []
-    try:
-        resp = httpx.get(
+    resp = await source_guard("jsearch").request(
+        lambda: get_http_client().get(
             f"{JSEARCH_BASE}/search",
             params={
                 "query": query,
-                "page": "1",
+                "page": str(page),
                 "num_pages": str(num_pages),
                 "country": country,
-                "date_posted": "all",
+                "date_posted": _jsearch_date_posted(since),
             },
             headers={
                 "x-rapidapi-host": "jsearch.p.rapidapi.com",
                 "x-rapidapi-key": api_key,
             },
-            timeout=20,
+            timeout=SOURCE_TIMEOUTS["jsearch"],
         )
-        if resp.status_code != 200:
-            return []
-        data = resp.json()
-        if data.get("status") != "OK":
-            return []
-        for item in data.get("data", []):
-            job_id = item.get("job_id") or item.get("job_uuid") or ""
-            raw = str(job_id) if job_id else str(item)
-            ext_id = f"jsearch_{hashlib.md5(raw.encode(errors='ignore')).hexdigest()[:24]}"
-            emp = item.get("employer")
-            employer = item.get("employer_name") or (emp.get("name") if isinstance(emp, dict) else str(emp or ""))
-            job = {
-                "external_id": ext_id,
-                "source": "jsearch",
-                "title": item.get("job_title", ""),
-                "company": employer,
-                "location": item.get("job_city") or item.get("job_country") or (item.get("job_location") or {}).get("display_name") if isinstance(item.get("job_location"), dict) else "",
-                "description": item.get("job_description", "")[:5000] if item.get("job_description") else "",
-                "url": item.get("job_apply_link") or item.get("job_google_link"),
-                "salary_min": str(item.get("job_min_salary", "")) if item.get("job_min_salary") else None,
-                "salary_max": str(item.get("job_max_salary", "")) if item.get("job_max_salary") else None,
-                "raw_data": {k: v for k, v in item.items() if k not in ("job_description",)},
-            }
-            if not job["location"] and isinstance(item.get("job_location"), dict):
-                job["location"] = item["job_location"].get("display_name", "")
-            jobs.append(job)
-            _upsert_external_job(db, job)
-        db.commit()
-    except Exception:
-        pass
-    return jobs
-
-
-def _upsert_external_job(db: Session, job: dict) -> None:
-    """Insert or skip if exists (by external_id + source)."""
-    existing = db.query(ExternalJob).filter(
-        ExternalJob.external_id == job["external_id"],
-        ExternalJob.source == job["source"],
-    ).first()
-    if not existing:
-        ej = ExternalJob(**job)
-        db.add(ej)
-
-
-def fetch_all_sources(db: Session, query: str = "software engineer", country: str = "us") -> list[dict]:
-    """
-    Fetch from Adzuna and JSearch. JSearch aggregates LinkedIn, Indeed, Glassdoor, ZipRecruiter.
-    """
-    fetch_adzuna_jobs(db, region="us")
-    return fetch_jsearch_jobs(db, query=query, num_pages=1, country=country)
-
-
-def get_external_jobs(db: Session, limit: int = 50, query: str | None = None) -> list[dict]:
-    """
-    Get external jobs from DB. Optionally refresh from all sources first.
-    Uses query to trigger JSearch/Indeed fetch if provided.
-    """
-    if query and query.strip():
-        fetch_all_sources(db, query=query.strip()[:100])
-    jobs = db.query(ExternalJob).order_by(ExternalJob.fetched_at.desc()).limit(limit).all()
-    return [
-        {
-            "id": str(j.id),
-            "source": j.source,
-            "title": j.title,
-            "company": j.company,
-            "location": j.location,
-            "description": (j.description or "")[:500],
-            "url": j.url,
-            "salary_min": j.salary_min,
-            "salary_max": j.salary_max,
+    )
+    data = resp.json()
+    if data.get("status") != "OK":
+        raise UpstreamError(f"jsearch: status {data.get('status')!r}")
+    return [_jsearch_job(item) for item in data.get("data", [])]
+
+
+# Listing fields whose change means the stored row (and its embedding) is stale
+CONTENT_FIELDS = ("title", "company", "location", "description", "url", "salary_min", "salary_max")
+# Parsed for SQL filtering; they only restate the content fields, so they stay out of content_hash
+DERIVED_FIELDS = ("remote", "salary_min_value", "salary_max_value")
+UPSERT_CHUNK = 500  # rows per INSERT; keeps bind parameters well under the driver limit
+
+
+def external_job_content_hash(job: dict) -> str:
+    """SHA-256 over the listing's content fields; equal hashes mean nothing worth re-storing changed."""
+    payload = json.dumps({f: job.get(f) for f in CONTENT_FIELDS}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def upsert_external_jobs(db: AsyncSession, jobs: list[dict]) -> dict:
+    """
+    Write a fetched page with one INSERT ... ON CONFLICT (source, external_id) DO UPDATE per chunk.
+    Every row gets a fresh fetched_at; changed listings also get their new content and lose their embedding
+    so it is regenerated. Raw source payloads of new and changed listings go to external_job_payloads, off the
+    hot table. Near-duplicates of listings from other sources are then linked to one canonical row.
+    Returns {"inserted", "updated", "unchanged"} counts. Caller commits.
+    """
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    now = datetime.utcnow()
+    rows: dict[tuple[str, str], dict] = {}
+    payloads: dict[tuple[str, str], dict | None] = {}
+    for job in jobs:
+        if not job.get("external_id"):
+            continue
+        key = (job["source"], job["external_id"])
+        # One row per key: ON CONFLICT cannot touch the same row twice in a statement
+        row = {k: v for k, v in job.items() if k != "raw_data"}
+        rows[key] = {
+            **row,
+            "content_hash": external_job_content_hash(job),
+            "fingerprint": job_fingerprint(job),
+            "fetched_at": now,
         }
-        for j in jobs
-    ]
+        payloads[key] = job.get("raw_data")
+    # Sorted by key so overlapping upserts lock shared rows in the same order instead of deadlocking
+    items = sorted(rows.items())
+    for i in range(0, len(items), UPSERT_CHUNK):
+        chunk = dict(items[i:i + UPSERT_CHUNK])
+        stmt = insert(ExternalJob).values(list(chunk.values()))
+        # Rows stored before content hashes existed just get theirs filled in; their embedding is kept
+        changed = and_(ExternalJob.content_hash != None, ExternalJob.content_hash != stmt.excluded.content_hash)
+        # The subquery runs on the statement's snapshot, so it still sees the hash from before this upsert
+        # (NULL for rows it inserted); xmax = 0 only on freshly inserted tuples
+        result = await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_external_jobs_source_external_id",
+                set_={
+                    **{f: getattr(stmt.excluded, f) for f in (*CONTENT_FIELDS, *DERIVED_FIELDS, "posted_at", "content_hash", "fingerprint", "fetched_at")},
+                    "embedding": case((changed, null()), else_=ExternalJob.embedding),
+                    "embedding_model": case((changed, null()), else_=ExternalJob.embedding_model),
+                },
+            ).returning(
+                ExternalJob.id,
+                ExternalJob.source,
+                ExternalJob.external_id,
+                ExternalJob.content_hash,
+                literal_column("xmax = 0", Boolean).label("inserted"),
+                literal_column(
+                    "(SELECT previous.content_hash FROM external_jobs AS previous WHERE previous.id = external_jobs.id)",
+                    String,
+                ).label("previous_hash"),
+            )
+        )
+        payload_rows = []
+        for r in result.all():
+            if r.inserted:
+                stats["inserted"] += 1
+            elif r.previous_hash is not None and r.previous_hash != r.content_hash:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+            if r.inserted or r.previous_hash != r.content_hash:
+                payload_rows.append({"external_job_id": r.id, "raw_data": payloads[(r.source, r.external_id)], "fetched_at": now})
+        if payload_rows:
+            payload_stmt = insert(ExternalJobPayload).values(payload_rows)
+            await db.execute(
+                payload_stmt.on_conflict_do_update(
+                    index_elements=[ExternalJobPayload.external_job_id],
+                    set_={"raw_data": payload_stmt.excluded.raw_data, "fetched_at": payload_stmt.excluded.fetched_at},
+                )
+            )
+    # Cluster cross-source duplicates among the blocks this page touched
+    await link_duplicates(db, (row["fingerprint"] for row in rows.values()))
+    return stats
+
+
+CRAWL_CONCURRENCY = 3  # pages requested at once per source; a stop wastes at most this many - 1
+
+
+def _page_fetcher(source: str, query: str, region: str, since: datetime | None):
+    if source == "adzuna":
+        adzuna_region = region if region in REGIONS else "us"
+        return lambda page: fetch_adzuna_jobs(query=query, region=adzuna_region, page=page, since=since)
+    return lambda page: fetch_jsearch_jobs(query=query, page=page, country=region, since=since)
+
+
+async def crawl_source(source: str, query: str, region: str, max_pages: int = 1) -> dict:
+    """
+    Walk up to `max_pages` pages of one source, newest first, CRAWL_CONCURRENCY pages at a time.
+    Requests are narrowed to postings after the stored high-water mark, and the walk stops at the first
+    empty page or page with no new external_ids. Each page is upserted and committed in its own short
+    transaction, so row locks are held for one page and a later failure keeps the pages already stored.
+    The high-water mark only advances when the walk reached already-stored postings that way; after a fetch
+    error or with the page budget spent, the pages in between were never seen, so the next run starts from
+    the old mark again.
+    """
+    async with AsyncSessionLocal() as db:
+        state = await db.get(ExternalJobSyncState, (source, query, region))
+    since = state.high_water_mark if state else None
+    fetch_page = _page_fetcher(source, query, region, since)
+
+    stats = {"fetched": 0, "inserted": 0, "updated": 0, "unchanged": 0, "pages": 0}
+    newest = since
+    page, done, caught_up = 1, False, False
+    while not done and page <= max_pages:
+        wave = list(range(page, min(page + CRAWL_CONCURRENCY, max_pages + 1)))
+        results = await asyncio.gather(*(fetch_page(p) for p in wave), return_exceptions=True)
+        for p, jobs in zip(wave, results):
+            if isinstance(jobs, BaseException):
+                # UpstreamError messages are ours; anything else is reduced to its type (URLs carry API keys)
+                reason = str(jobs) if isinstance(jobs, UpstreamError) else type(jobs).__name__
+                logger.warning("External job fetch failed for %s page %d: %s", source, p, reason)
+                done = True
+                break
+            if not jobs:
+                done = caught_up = True
+                break
+            async with AsyncSessionLocal() as db:
+                page_stats = await upsert_external_jobs(db, jobs)
+                await db.commit()
+            stats["pages"] += 1
+            stats["fetched"] += len(jobs)
+            for key in ("inserted", "updated", "unchanged"):
+                stats[key] += page_stats[key]
+            posted = [j["posted_at"] for j in jobs if j.get("posted_at")]
+            if posted and (newest is None or max(posted) > newest):
+                newest = max(posted)
+            if page_stats["inserted"] == 0:
+                done = caught_up = True  # only known postings: everything older is already stored
+                break
+        page += len(wave)
+
+    high_water_mark = newest if caught_up else since
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            insert(ExternalJobSyncState)
+            .values(source=source, query=query, region=region, high_water_mark=high_water_mark,
+                    last_run_at=datetime.utcnow(), last_pages=stats["pages"])
+            .on_conflict_do_update(
+                constraint="pk_external_job_sync_state",
+                set_={"high_water_mark": high_water_mark, "last_run_at": datetime.utcnow(), "last_pages": stats["pages"]},
+            )
+        )
+        await db.commit()
+    return stats
+
+
+async def fetch_all_sources(query: str = "software engineer", country: str = "us", max_pages: int = 1) -> dict:
+    """
+    Crawl Adzuna and JSearch concurrently (up to `max_pages` each) and upsert the results, one committed
+    transaction per page. JSearch aggregates LinkedIn, Indeed, Glassdoor, ZipRecruiter. A source that fails
+    or times out stops early; the others still land. Returns summed {"fetched", "inserted", "updated",
+    "unchanged", "pages"}.
+    """
+    results = await asyncio.gather(
+        *(crawl_source(source, query, country, max_pages) for source in ("adzuna", "jsearch"))
+    )
+    stats = {key: sum(r[key] for r in results) for key in results[0]}
+    logger.info("External jobs for %r/%s: %s", query, country, stats)
+    return stats
+
+
+MAX_SALARY_AMOUNT = 2_000_000_000  # INTEGER column; anything larger is a parsing artefact
+
+
+def salary_amount(value) -> int | None:
+    """Numeric salary from a source value ("85000", 85000.0, "85000.00"); None if missing or not a number."""
+    try:
+        amount = int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return amount if 0 < amount < MAX_SALARY_AMOUNT else None
+
+
+def external_job_filters(
+    q: str | None = None,
+    location: str | None = None,
+    remote: bool | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+) -> list:
+    """
+    WHERE clauses shared by every external-listing read: canonical rows only, full-text q (GIN), location
+    substring (trigram GIN), remote flag, and a salary window that the listing's range must reach into.
+    """
+    clauses = [ExternalJob.canonical_id == None]
+    tsquery = build_tsquery(q)
+    if tsquery:
+        clauses.append(text_match(ExternalJob.search_vector, tsquery))
+    if location and location.strip():
+        clauses.append(ExternalJob.location.ilike(f"%{location.strip()}%"))
+    if remote is not None:
+        clauses.append(ExternalJob.remote == remote)
+    if salary_min is not None:
+        clauses.append(func.coalesce(ExternalJob.salary_max_value, ExternalJob.salary_min_value) >= salary_min)
+    if salary_max is not None:
+        clauses.append(func.coalesce(ExternalJob.salary_min_value, ExternalJob.salary_max_value) <= salary_max)
+    return clauses
+
+
+def _external_jobs_stmt(limit: int, q: str | None, **filters):
+    stmt = select(*external_job_columns()).where(*external_job_filters(q, **filters))
+    tsquery = build_tsquery(q)
+    if tsquery:
+        stmt = stmt.order_by(text_rank(ExternalJob.search_vector, tsquery).desc(), ExternalJob.fetched_at.desc())
+    else:
+        stmt = stmt.order_by(ExternalJob.fetched_at.desc())
+    return stmt.limit(limit)
+
+
+async def list_external_jobs(db: AsyncSession, limit: int = 50, q: str | None = None, **filters) -> list[dict]:
+    """
+    External jobs from the DB (read-only; refreshing is the ingestion scheduler's job), filtered in SQL
+    (see external_job_filters). Best text match first when q is given, newest first otherwise.
+    """
+    result = await db.execute(_external_jobs_stmt(limit, q, **filters))
+    return [external_job_to_dict(j) for j in result.all()]
+
+
+_external_reads: ReadGate | None = None
+
+
+def external_reads() -> ReadGate:
+    """Admission gate for request-path external-job reads (bounded concurrency + queue, 503 beyond)."""
+    global _external_reads
+    if _external_reads is None:
+        s = get_settings()
+        _external_reads = ReadGate("External job search", s.EXTERNAL_READ_CONCURRENCY, s.EXTERNAL_READ_QUEUE)
+    return _external_reads
+
+
+async def read_external_jobs(limit: int = 50, q: str | None = None, **filters) -> list[dict]:
+    """
+    Request-path read: waits for a gate slot, then runs on its own short-lived AsyncSession so the
+    connection is held only for the query and never shared with the caller's session.
+    """
+    async with external_reads().slot():
+        async with AsyncSessionLocal() as db:
+            return await list_external_jobs(db, limit, q, **filters)
+
+
+def external_job_columns() -> tuple:
+    """Columns behind external_job_to_dict; select these instead of whole rows (skips search and embedding columns)."""
+    return (
+        ExternalJob.id,
+        ExternalJob.source,
+        ExternalJob.title,
+        ExternalJob.company,
+        ExternalJob.location,
+        ExternalJob.description,
+        ExternalJob.remote,
+        ExternalJob.url,
+        ExternalJob.salary_min,
+        ExternalJob.salary_max,
+    )
+
+
+def external_job_to_dict(j) -> dict:
+    """Public listing shape shared by /external-jobs and the matching endpoints (ORM row or column row)."""
+    return {
+        "id": str(j.id),
+        "source": j.source,
+        "title": j.title,
+        "company": j.company,
+        "location": j.location,
+        "description": (j.description or "")[:500],
+        "remote": j.remote,
+        "url": j.url,
+        "salary_min": j.salary_min,
+        "salary_max": j.salary_max,
+    }
@@ -0,0 +1,105 @@
+"""
+Cross-source deduplication of external listings. The same posting often arrives from Adzuna and JSearch
+(or twice from one source) under different external_ids. Listings are blocked by a fingerprint of the
+normalized title + company + city, and within a block confirmed as near-duplicates by the Hamming distance
+of 64-bit SimHashes over description word shingles. Adzuna only returns a snippet where JSearch has the full
+text, so two descriptions are compared over their shared leading words. Each cluster keeps one canonical row
+(canonical_id NULL); the rest point at it and are never served, embedded or scored.
+"""
+import hashlib
+import re
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import ExternalJob
+
+SHINGLE_WORDS = 3
+SIMHASH_MAX_DISTANCE = 6  # of 64 bits; rewordings and boilerplate differences stay well under this
+MIN_DESCRIPTION_WORDS = 20  # shared prefix needed before two descriptions can be called duplicates
+
+_WORD = re.compile(r"[a-z0-9]+")
+# Company suffixes that differ between sources for the same employer
+_COMPANY_NOISE = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "plc", "gmbh", "the"}
+
+
+def _words(text: str | None) -> list[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def _city(location: str | None) -> str:
+    # Sources agree on the leading place name far more often than on the state/country suffix
+    return " ".join(_words((location or "").split(",")[0]))
+
+
+def job_fingerprint(job: dict) -> str:
+    """Blocking key: normalized title + company + city, so one role posted in several cities stays apart."""
+    title = " ".join(_words(job.get("title")))
+    company = " ".join(w for w in _words(job.get("company")) if w not in _COMPANY_NOISE)
+    return hashlib.sha256(f"{title}|{company}|{_city(job.get('location'))}".encode()).hexdigest()
+
+
+def simhash(words: list[str]) -> int:
+    """64-bit SimHash of word shingles."""
+    weights = [0] * 64
+    for i in range(max(1, len(words) - SHINGLE_WORDS + 1)):
+        h = int.from_bytes(hashlib.blake2b(" ".join(words[i:i + SHINGLE_WORDS]).encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _near_duplicate(a: list[str], b: list[str]) -> bool:
+    """Descriptions match over their shared prefix (snippet vs full text); too little text is never a match."""
+    n = min(len(a), len(b))
+    if n < MIN_DESCRIPTION_WORDS:
+        return False
+    return bin(simhash(a[:n]) ^ simhash(b[:n])).count("1") <= SIMHASH_MAX_DISTANCE
+
+
+def _canonical_priority(row, referenced: set) -> tuple:
+    # Keep the row that is canonical already (it has the embedding and cached match scores); new rows last
+    return (
+        row.id not in referenced,
+        row.canonical_id is not None,
+        row.embedding_model is None,
+        row.posted_at or datetime.max,
+        row.id,
+    )
+
+
+async def link_duplicates(db: AsyncSession, fingerprints) -> int:
+    """
+    Re-cluster every listing in the given fingerprint blocks and point duplicates at their canonical row.
+    Rows that are canonical for others already stay canonical, so re-ingesting a block does not move it.
+    Returns rows whose canonical_id changed. Caller commits.
+    """
+    fingerprints = list(set(fingerprints))
+    if not fingerprints:
+        return 0
+    result = await db.execute(
+        select(
+            ExternalJob.id, ExternalJob.fingerprint, ExternalJob.description, ExternalJob.canonical_id,
+            ExternalJob.embedding_model, ExternalJob.posted_at,
+        ).where(ExternalJob.fingerprint.in_(fingerprints))
+    )
+    blocks: dict[str, list] = {}
+    for row in result.all():
+        blocks.setdefault(row.fingerprint, []).append(row)
+    params = []
+    for block in blocks.values():
+        referenced = {row.canonical_id for row in block if row.canonical_id is not None}
+        canonicals: list[tuple] = []  # (row, description words)
+        for row in sorted(block, key=lambda r: _canonical_priority(r, referenced)):
+            words = _words(row.description)
+            canonical = next((c for c, c_words in canonicals if _near_duplicate(c_words, words)), None)
+            canonical_id = canonical.id if canonical is not None else None
+            if canonical is None:
+                canonicals.append((row, words))
+            if row.canonical_id != canonical_id:
+                params.append({"id": row.id, "canonical_id": canonical_id})
+    if params:
+        await db.execute(update(ExternalJob), params)
+    return len(params)
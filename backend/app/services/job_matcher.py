@@ -1,105 +1,40 @@
 import os
 import json
-from openai import OpenAI
-from sqlalchemy.future import select
-from app.db.session import AsyncSessionLocal
-from app.models import Candidate, Job
+import asyncio
+from functools import lru_cache
+from app.core.config import get_settings
+from app.services.embeddings import embed_pending, embedding_batcher, generate_embeddings
 
 
-def _get_client():
-    key = os.getenv("OPENAI_API_KEY") or "sk-placeholder"
-    return OpenAI(api_key=key)
+async def generate_embedding(text: str, model: str | None = None) -> list[float] | None:
+    """Generate a vector embedding using OpenAI (single text; see embeddings.generate_embeddings for bulk)."""
+    return (await generate_embeddings([text], model=model))[0]
 
-async def generate_embedding(text: str, model: str = "text-embedding-3-small") -> list[float] | None:
-    """Generate a vector embedding using OpenAI."""
-    if not os.getenv("OPENAI_API_KEY") or not text.strip():
-        return None
-    try:
-        from openai import AsyncOpenAI
-        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = await client.embeddings.create(input=[text], model=model)
-        return response.data[0].embedding
-    except Exception as e:
-        print(f"Error generating embedding: {e}")
-        return None
-
-def get_candidate_text(c) -> str:
-    """Convert a candidate model to text for embedding."""
-    skills = c.skills if isinstance(c.skills, list) else []
-    exp = c.experience if isinstance(c.experience, list) else []
-    exp_text = "; ".join([f"{e.get('title', '')} at {e.get('company', '')}" for e in exp if isinstance(e, dict)])
-    parts = [
-        f"Role: {c.headline or c.full_name}",
-        f"Skills: {', '.join(skills)}",
-        f"Experience: {exp_text}",
-        f"Summary: {c.summary or ''}"
-    ]
-    return " ".join(parts)[:8000]
-
-def get_job_text(j) -> str:
-    """Convert a job model or dict to text for embedding."""
-    if isinstance(j, dict):
-        title = j.get("title", "")
-        company = j.get("company", "")
-        desc = j.get("description", "")
-    else:
-        title = getattr(j, "title", "")
-        company = getattr(j.employer, "company_name", "") if getattr(j, "employer", None) else ""
-        desc = getattr(j, "description", "")
-    return f"Job Title: {title}. Company: {company}. Description: {desc}"[:8000]
 
 async def update_candidate_embedding_task(candidate_id):
-    """Background worker to update candidate embedding."""
-    async with AsyncSessionLocal() as db:
-        result = await db.execute(select(Candidate).where(Candidate.id == candidate_id))
-        c = result.scalars().first()
-        if c:
-            text = get_candidate_text(c)
-            emb = await generate_embedding(text)
-            if emb:
-                c.embedding = emb
-                await db.commit()
+    """Background worker to update candidate embedding. Batched with other pending rows."""
+    await embedding_batcher.submit("candidate", candidate_id)
+
 
 async def update_job_embedding_task(job_id):
-    """Background worker to update job embedding."""
-    async with AsyncSessionLocal() as db:
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        j = result.scalars().first()
-        if j:
-            text = get_job_text(j)
-            emb = await generate_embedding(text)
-            if emb:
-                j.embedding = emb
-                await db.commit()
-
-MATCH_PROMPT = """Given a candidate profile and a job listing, score how well the candidate fits the job from 0-100.
+    """Background worker to update job embedding. Batched with other pending rows."""
+    await embedding_batcher.submit("job", job_id)
 
-Candidate profile:
-- Skills: {skills}
-- Experience summary: {experience}
-- Job fit indicators (roles they suit): {job_fit}
-- Suggested roles (roles they might not consider but fit well): {suggested_roles}
-- Location: {location}
 
-Job:
-- Title: {job_title}
-- Company: {company}
-- Description: {job_description}
-- Location: {job_location}
+EXTERNAL_EMBED_BATCH = 500
 
-Return ONLY a JSON object: {{"score": number 0-100, "reason": "1-2 sentence explanation of fit", "suggested_for_you": boolean}}
-- suggested_for_you: true if this job matches suggested_roles OR is a strong fit (score>=75) for a role type they might not have searched for. false otherwise.
-No markdown. No other text."""
 
+async def embed_external_jobs_task(limit: int = EXTERNAL_EMBED_BATCH):
+    """Background worker: embed newly ingested external jobs so they join vector ranking."""
+    await embed_pending("external_job", limit=limit)
 
-def compute_match_score(
-    candidate: dict,
-    job: dict,
-) -> dict:
-    """Compute match score (0-100) and reason using OpenAI."""
-    if not os.getenv("OPENAI_API_KEY"):
-        return {"score": 50, "reason": "AI matching not configured"}
-    
+
+MATCH_MODEL = "gpt-4o-mini"
+MATCH_UNAVAILABLE = {"score": 50, "reason": "Unable to compute match", "suggested_for_you": False}
+MATCH_TIMED_OUT = {"score": 50, "reason": "Match scoring timed out", "suggested_for_you": False}
+
+def candidate_prompt_fields(candidate: dict) -> dict:
+    """Flatten the candidate dict into the strings used by the match prompts."""
     skills = candidate.get("skills") or []
     if isinstance(skills, list):
         skills = ", ".join(str(s) for s in skills[:20])
@@ -126,35 +61,135 @@ def compute_match_score(
     else:
         suggested_roles = str(suggested_roles)
 
-    prompt = MATCH_PROMPT.format(
-        skills=skills,
-        experience=exp_str or "Not specified",
-        job_fit=job_fit or "Not specified",
-        suggested_roles=suggested_roles or "None",
-        location=candidate.get("location") or "Not specified",
-        job_title=job.get("title", ""),
-        company=job.get("company", ""),
-        job_description=(job.get("description") or "")[:800],
-        job_location=job.get("location") or "Not specified",
-    )
+    return {
+        "skills": skills,
+        "experience": exp_str or "Not specified",
+        "job_fit": job_fit or "Not specified",
+        "suggested_roles": suggested_roles or "None",
+        "location": candidate.get("location") or "Not specified",
+    }
+
+
+def _strip_json_fence(raw: str) -> str:
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    return raw
 
+
+def _match_result(data: dict) -> dict:
+    return {
+        "score": min(100, max(0, int(data.get("score", 50)))),
+        "reason": data.get("reason", ""),
+        "suggested_for_you": data.get("suggested_for_you", False),
+    }
+
+
+BATCH_MATCH_PROMPT = """Given a candidate profile and a numbered list of job listings, score how well the candidate fits EACH job from 0-100.
+
+Candidate profile:
+- Skills: {skills}
+- Experience summary: {experience}
+- Job fit indicators (roles they suit): {job_fit}
+- Suggested roles (roles they might not consider but fit well): {suggested_roles}
+- Location: {location}
+
+Jobs:
+{jobs}
+
+Return ONLY a JSON object: {{"results": [{{"index": number, "score": number 0-100, "reason": "1-2 sentence explanation of fit", "suggested_for_you": boolean}}]}}
+Include exactly one result per job, using the job's index.
+- suggested_for_you: true if the job matches suggested_roles OR is a strong fit (score>=75) for a role type they might not have searched for. false otherwise.
+No markdown. No other text."""
+
+_BATCH_JOB_LINE = "[{index}] Title: {title} | Company: {company} | Location: {location} | Description: {description}"
+
+
+@lru_cache(maxsize=1)
+def _get_async_client():
+    """Shared async client so concurrent scoring reuses one connection pool."""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY") or "sk-placeholder")
+
+
+def is_fallback_match(match: dict) -> bool:
+    """True for the neutral placeholder results (not configured, failed, timed out) that must not be cached."""
+    return match.get("reason") in (MATCH_UNAVAILABLE["reason"], MATCH_TIMED_OUT["reason"], "AI matching not configured")
+
+
+async def _score_chunk(prompt_fields: dict, jobs: list[dict]) -> list[dict]:
+    """Score one chunk of jobs with a single multi-item prompt."""
+    lines = [
+        _BATCH_JOB_LINE.format(
+            index=i,
+            title=job.get("title", ""),
+            company=job.get("company", ""),
+            location=job.get("location") or "Not specified",
+            description=(job.get("description") or "")[:800].replace("\n", " "),
+        )
+        for i, job in enumerate(jobs)
+    ]
+    prompt = BATCH_MATCH_PROMPT.format(**prompt_fields, jobs="\n".join(lines))
     try:
-        client = _get_client()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await _get_async_client().chat.completions.create(
+            model=MATCH_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
         )
-        raw = response.choices[0].message.content.strip()
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        data = json.loads(raw)
-        return {
-            "score": min(100, max(0, int(data.get("score", 50)))),
-            "reason": data.get("reason", ""),
-            "suggested_for_you": data.get("suggested_for_you", False),
+        data = json.loads(_strip_json_fence(response.choices[0].message.content or ""))
+        by_index = {
+            int(r["index"]): _match_result(r)
+            for r in data.get("results", [])
+            if isinstance(r, dict) and "index" in r
         }
     except Exception:
-        return {"score": 50, "reason": "Unable to compute match", "suggested_for_you": False}
+        by_index = {}
+    return [by_index.get(i, dict(MATCH_UNAVAILABLE)) for i in range(len(jobs))]
+
+
+async def compute_match_scores(
+    candidate: dict,
+    jobs: list[dict],
+    *,
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+) -> list[dict]:
+    """
+    Score many jobs for one candidate without blocking the event loop.
+    Jobs are packed into multi-item prompts of `batch_size`, at most `concurrency` prompts run at once,
+    and whatever has not finished after `deadline` seconds gets a neutral result (partial results are kept).
+    Returns one result per job, in input order.
+    """
+    if not jobs:
+        return []
+    if not os.getenv("OPENAI_API_KEY"):
+        return [{"score": 50, "reason": "AI matching not configured"} for _ in jobs]
+
+    settings = get_settings()
+    batch_size = max(1, batch_size or settings.MATCH_SCORE_BATCH_SIZE)
+    concurrency = max(1, concurrency or settings.MATCH_SCORE_CONCURRENCY)
+    deadline = deadline if deadline is not None else settings.MATCH_SCORE_DEADLINE_SECONDS
+
+    prompt_fields = candidate_prompt_fields(candidate)
+    semaphore = asyncio.Semaphore(concurrency)
+    chunks = [(start, jobs[start:start + batch_size]) for start in range(0, len(jobs), batch_size)]
+
+    async def run(chunk: list[dict]) -> list[dict]:
+        async with semaphore:
+            return await _score_chunk(prompt_fields, chunk)
+
+    tasks = {asyncio.create_task(run(chunk)): start for start, chunk in chunks}
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results = [dict(MATCH_TIMED_OUT) for _ in jobs]
+    for task in done:
+        if task.cancelled() or task.exception() is not None:
+            continue
+        start = tasks[task]
+        results[start:start + len(task.result())] = task.result()
+    return results
@@ -0,0 +1,117 @@
+"""
+Persistent cache of LLM match scores in the `matches` table.
+Rows are keyed by (candidate_id, external_job_id) and carry a content hash of the exact inputs the score was
+computed from, so editing the profile or a refreshed listing invalidates the entry without explicit purges.
+"""
+import hashlib
+import json
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Match
+from app.services.job_matcher import (
+    BATCH_MATCH_PROMPT,
+    MATCH_MODEL,
+    candidate_prompt_fields,
+    compute_match_scores,
+    is_fallback_match,
+)
+
+# Changing the prompt or model must invalidate every cached score
+_SCORER_VERSION = hashlib.sha256(f"{MATCH_MODEL}\n{BATCH_MATCH_PROMPT}".encode()).hexdigest()[:16]
+
+
+def match_content_hash(candidate: dict, job: dict) -> str:
+    """Hash of the candidate and job fields the scorer sees (plus scorer version)."""
+    payload = {
+        "v": _SCORER_VERSION,
+        "candidate": candidate_prompt_fields(candidate),
+        "job": {
+            "title": job.get("title") or "",
+            "company": job.get("company") or "",
+            "location": job.get("location") or "",
+            "description": (job.get("description") or "")[:800],
+        },
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _external_job_uuid(job: dict) -> UUID | None:
+    try:
+        return UUID(str(job.get("id")))
+    except (TypeError, ValueError):
+        return None
+
+
+async def get_match_scores_cached(db: AsyncSession, candidate: dict, jobs: list[dict]) -> list[dict]:
+    """
+    Scores for external jobs, served from `matches` when the content hash still matches.
+    Misses are scored in one batched call and written back; neutral fallback results are never stored.
+    Returns one result per job, in input order.
+    """
+    if not jobs:
+        return []
+    candidate_id = UUID(str(candidate["id"]))
+    job_ids = [_external_job_uuid(j) for j in jobs]
+    hashes = [match_content_hash(candidate, j) for j in jobs]
+
+    cached: dict[UUID, Match] = {}
+    known_ids = [jid for jid in job_ids if jid is not None]
+    if known_ids:
+        rows = await db.execute(
+            select(Match).where(Match.candidate_id == candidate_id, Match.external_job_id.in_(known_ids))
+        )
+        cached = {m.external_job_id: m for m in rows.scalars().all()}
+
+    results: list[dict | None] = [None] * len(jobs)
+    misses: list[int] = []
+    for i, (jid, h) in enumerate(zip(job_ids, hashes)):
+        hit = cached.get(jid) if jid is not None else None
+        if hit is not None and hit.content_hash == h:
+            explanation = hit.explanation or {}
+            results[i] = {
+                "score": hit.score,
+                "reason": explanation.get("reason", ""),
+                "suggested_for_you": explanation.get("suggested_for_you", False),
+            }
+        else:
+            misses.append(i)
+
+    if misses:
+        computed = await compute_match_scores(candidate, [jobs[i] for i in misses])
+        now = datetime.utcnow()
+        to_store = []
+        for i, match in zip(misses, computed):
+            results[i] = match
+            if job_ids[i] is not None and not is_fallback_match(match):
+                to_store.append({
+                    "candidate_id": candidate_id,
+                    "external_job_id": job_ids[i],
+                    "score": match["score"],
+                    "explanation": {"reason": match["reason"], "suggested_for_you": match.get("suggested_for_you", False)},
+                    "content_hash": hashes[i],
+                    "created_at": now,
+                    "updated_at": now,
+                })
+        if to_store:
+            stmt = insert(Match).values(to_store)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_match_candidate_external_job",
+                set_={
+                    "score": stmt.excluded.score,
+                    "explanation": stmt.excluded.explanation,
+                    "content_hash": stmt.excluded.content_hash,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            try:
+                await db.execute(stmt)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+
+    return results  # type: ignore[return-value]
@@ -0,0 +1,52 @@
+"""
+Content-addressed cache of resume parser output in the `parsed_resumes` table.
+Rows are keyed by a SHA-256 of the extracted text plus the parser version (model and prompt), so re-uploads,
+retries and the same file on another account are served without an OpenAI call, and changing the prompt or
+model starts a fresh cache. Only AI results are stored: fallback output is cheap to recompute and must not
+outlive a missing or invalid key.
+"""
+import hashlib
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ParsedResume
+from app.services.resume_parser import RESUME_EXTRACT_PROMPT, RESUME_PARSE_MODEL
+
+# Changing the prompt or model must invalidate every cached parse
+_PARSER_VERSION = hashlib.sha256(f"{RESUME_PARSE_MODEL}\n{RESUME_EXTRACT_PROMPT}".encode()).hexdigest()[:16]
+
+
+def resume_content_hash(text: str) -> str:
+    return hashlib.sha256(f"{_PARSER_VERSION}\n{text}".encode()).hexdigest()
+
+
+async def get_cached_resume(db: AsyncSession, content_hash: str) -> tuple[dict, list[str], bool] | None:
+    """(parsed, warnings, ai_used) stored for this hash, or None on a miss."""
+    hit = await db.get(ParsedResume, content_hash)
+    if hit is None:
+        return None
+    await db.execute(
+        update(ParsedResume).where(ParsedResume.content_hash == content_hash).values(last_used_at=datetime.utcnow())
+    )
+    await db.commit()
+    return hit.parsed, list(hit.warnings or []), hit.ai_used
+
+
+async def store_parsed_resume(
+    db: AsyncSession, content_hash: str, parsed: dict, warnings: list[str], ai_used: bool
+) -> None:
+    if not ai_used:
+        return
+    now = datetime.utcnow()
+    stmt = insert(ParsedResume).values(
+        content_hash=content_hash, parsed=parsed, warnings=warnings, ai_used=ai_used, created_at=now, last_used_at=now
+    )
+    stmt = stmt.on_conflict_do_nothing(index_elements=["content_hash"])
+    try:
+        await db.execute(stmt)
+        await db.commit()
+    except Exception:
+        await db.rollback()
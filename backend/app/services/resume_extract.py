@@ -1,28 +1,225 @@
-"""Extract text from resume files (PDF, DOCX)."""
+"""
+Extract text from resume files (PDF, DOCX, TXT).
+
+Extraction is CPU-bound and pathological PDFs can take seconds, so the resume workers run it in a small
+process pool (`extract_resume_text`) rather than on a thread holding the GIL. Each document gets a page cap
+and a CPU-time limit enforced inside the pool process; the whole text is returned, since it is stored on the
+profile (only the parser's prompt is truncated). Per-format timings are kept for the status endpoint.
+"""
+import asyncio
 import io
+import logging
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
 from pypdf import PdfReader
 from docx import Document
 
+from app.core.config import get_settings
+
+try:
+    import resource  # POSIX only; without it the CPU limit falls back to the wall-clock timeout
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(content: bytes) -> str:
-    """Extract text from PDF bytes."""
+
+class ExtractionLimitExceeded(ValueError):
+    """A document used up its CPU-time budget; the message is meant for the user."""
+
+
+def extract_text_from_pdf(content: bytes, max_pages: int | None = None, max_chars: int | None = None) -> str:
+    """Extract text from PDF bytes: at most `max_pages` pages, stopping once `max_chars` are collected."""
     reader = PdfReader(io.BytesIO(content))
-    return "\n".join(page.extract_text() or "" for page in reader.pages)
+    parts: list[str] = []
+    collected = 0
+    for i, page in enumerate(reader.pages):
+        if max_pages is not None and i >= max_pages:
+            break
+        text = page.extract_text() or ""
+        parts.append(text)
+        collected += len(text) + 1
+        if max_chars is not None and collected >= max_chars:
+            break
+    return "\n".join(parts)
 
 
-def extract_text_from_docx(content: bytes) -> str:
-    """Extract text from DOCX bytes."""
+def extract_text_from_docx(content: bytes, max_chars: int | None = None) -> str:
+    """Extract text from DOCX bytes, stopping once `max_chars` are collected."""
     doc = Document(io.BytesIO(content))
-    return "\n".join(p.text for p in doc.paragraphs)
+    parts: list[str] = []
+    collected = 0
+    for p in doc.paragraphs:
+        parts.append(p.text)
+        collected += len(p.text) + 1
+        if max_chars is not None and collected >= max_chars:
+            break
+    return "\n".join(parts)
 
 
-def extract_text_from_file(content: bytes, filename: str) -> str:
-    """Extract text from resume file based on extension."""
+def resume_format(filename: str) -> str:
     lower = filename.lower()
     if lower.endswith(".pdf"):
-        return extract_text_from_pdf(content)
+        return "pdf"
     if lower.endswith(".docx") or lower.endswith(".doc"):
-        return extract_text_from_docx(content)
+        return "docx"
     if lower.endswith(".txt"):
-        return content.decode("utf-8", errors="ignore")
+        return "txt"
     raise ValueError("Unsupported file type. Use PDF, DOCX, or TXT.")
+
+
+def extract_text_from_file(
+    content: bytes, filename: str, max_pages: int | None = None, max_chars: int | None = None
+) -> str:
+    """Extract text from resume file based on extension."""
+    fmt = resume_format(filename)
+    if fmt == "pdf":
+        return extract_text_from_pdf(content, max_pages=max_pages, max_chars=max_chars)
+    if fmt == "docx":
+        return extract_text_from_docx(content, max_chars=max_chars)
+    text = content.decode("utf-8", errors="ignore")
+    return text[:max_chars] if max_chars is not None else text
+
+
+def _raise_cpu_exceeded(_signum, _frame):
+    raise ExtractionLimitExceeded("This file took too long to read. Try a smaller PDF or a DOCX.")
+
+
+def _init_extract_process() -> None:
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _raise_cpu_exceeded)
+
+
+def _extract_in_process(path: str, filename: str, max_pages: int, max_chars: int | None, cpu_seconds: int) -> str:
+    """Pool-side entry point. RLIMIT_CPU counts the whole process, so the soft limit is re-armed per document."""
+    if resource is None:
+        return extract_text_from_file(Path(path).read_bytes(), filename, max_pages, max_chars)
+    previous_soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    try:
+        return extract_text_from_file(Path(path).read_bytes(), filename, max_pages, max_chars)
+    finally:
+        # Back to the limit the process started with; raising the soft limit above a finite hard one is an error
+        resource.setrlimit(resource.RLIMIT_CPU, (previous_soft, hard))
+
+
+class ExtractionPool:
+    """Lazily started process pool for resume extraction, with per-format timing counters."""
+
+    def __init__(self):
+        self._pool: ProcessPoolExecutor | None = None
+        self._generation = 0  # bumped on every recycle, so a stale failure cannot tear down a fresh pool
+        self._slots: asyncio.Semaphore | None = None
+        self._stats: dict[str, dict] = {}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=get_settings().RESUME_EXTRACT_PROCESSES, initializer=_init_extract_process
+            )
+        return self._pool
+
+    def _free_slots(self) -> asyncio.Semaphore:
+        # One slot per process: documents wait here rather than in the pool's queue, so the timeout only
+        # starts counting once a process is free to run them
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(get_settings().RESUME_EXTRACT_PROCESSES)
+        return self._slots
+
+    def _recycle(self, generation: int) -> None:
+        """Terminate the pool's processes (a timed-out document keeps running otherwise); the next call starts a new pool."""
+        if self._pool is None or generation != self._generation:
+            return
+        pool, self._pool = self._pool, None
+        self._generation += 1
+        terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, fmt: str, elapsed: float, outcome: str) -> None:
+        stats = self._stats.setdefault(fmt, {"ok": 0, "failed": 0, "limited": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        stats[outcome] += 1
+        stats["total_seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    async def _run(self, fmt: str, path: str, filename: str, max_chars: int | None) -> str:
+        """Extract in a pool process; timings count from when a process is free, not from submission."""
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        async with self._free_slots():
+            pool = self._executor()
+            generation = self._generation
+            started = time.monotonic()
+            outcome = "failed"
+            try:
+                text = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        pool, _extract_in_process, path, filename,
+                        settings.RESUME_MAX_PAGES, max_chars, settings.RESUME_EXTRACT_CPU_SECONDS,
+                    ),
+                    timeout=settings.RESUME_EXTRACT_TIMEOUT_SECONDS,
+                )
+                outcome = "ok"
+                return text
+            except ExtractionLimitExceeded:
+                outcome = "limited"
+                raise
+            except asyncio.TimeoutError:
+                # wait_for only abandons the future; the document is still running and holding a process
+                logger.warning("Resume extraction of a %s upload timed out; restarting the pool", fmt)
+                outcome = "limited"
+                self._recycle(generation)
+                raise
+            except BrokenProcessPool:
+                # A pool process died (e.g. killed at the hard CPU limit or out of memory), or another
+                # document's timeout terminated the pool under us
+                self._recycle(generation)
+                raise
+            finally:
+                self._record(fmt, time.monotonic() - started, outcome)
+
+    async def extract(self, path: str, filename: str, max_chars: int | None = None) -> str:
+        """
+        Text of the stored upload at `path` (all of it unless `max_chars` is given); ValueError with a
+        user-facing message when it cannot be read.
+        """
+        fmt = resume_format(filename)
+        try:
+            try:
+                return await self._run(fmt, path, filename, max_chars)
+            except BrokenProcessPool:
+                # Retry once on a fresh pool: most often this document was only collateral of a recycle
+                logger.warning("Resume extraction pool broke on a %s upload; retrying on a new pool", fmt)
+                return await self._run(fmt, path, filename, max_chars)
+        except (ExtractionLimitExceeded, asyncio.TimeoutError):
+            raise ExtractionLimitExceeded("This file took too long to read. Try a smaller PDF or a DOCX.")
+
+    def snapshot(self) -> dict:
+        return {
+            fmt: {
+                "ok": s["ok"],
+                "failed": s["failed"],
+                "limited": s["limited"],
+                "avg_ms": round(1000 * s["total_seconds"] / max(1, s["ok"] + s["failed"] + s["limited"]), 2),
+                "max_ms": round(1000 * s["max_seconds"], 2),
+            }
+            for fmt, s in self._stats.items()
+        }
+
+    def close(self) -> None:
+        self._recycle(self._generation)
+
+
+extraction_pool = ExtractionPool()
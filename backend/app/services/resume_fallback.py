@@ -1,33 +1,123 @@
-"""Fallback resume parsing when OpenAI is unavailable. Extracts basics via regex/heuristics."""
+"""
+Fallback resume parsing when OpenAI is unavailable. Extracts basics via regex/heuristics.
+
+Every pattern is compiled once at import, and the text is lowercased and split into lines once per resume.
+Skills are found in a single scan by one regex built from SKILLS as a character trie (shared prefixes are
+matched once instead of trying every alias at every position), so adding skills or aliases costs no extra pass.
+"""
 import re
 from typing import Any
 
-
-def _extract_emails(text: str) -> list[str]:
-    pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-    return list(dict.fromkeys(re.findall(pattern, text)))
-
-
-def _extract_phones(text: str) -> list[str]:
-    # Common phone patterns
-    pattern = r"(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}"
-    return list(dict.fromkeys(re.findall(pattern, text)))
+# canonical skill -> aliases that count as a mention (matched case-insensitively on word boundaries)
+SKILLS: dict[str, tuple[str, ...]] = {
+    "python": ("python",),
+    "javascript": ("javascript", "js"),
+    "java": ("java",),
+    "react": ("react", "react.js", "reactjs"),
+    "node": ("node", "node.js", "nodejs"),
+    "sql": ("sql",),
+    "aws": ("aws", "amazon web services"),
+    "docker": ("docker",),
+    "kubernetes": ("kubernetes", "k8s"),
+    "typescript": ("typescript",),
+    "html": ("html", "html5"),
+    "css": ("css", "css3"),
+    "git": ("git",),
+    "rest": ("rest", "restful"),
+    "api": ("api", "apis"),
+    "agile": ("agile",),
+    "scrum": ("scrum",),
+    "leadership": ("leadership",),
+    "communication": ("communication",),
+    "analytics": ("analytics",),
+    "machine learning": ("machine learning",),
+    "data analysis": ("data analysis",),
+    "excel": ("excel",),
+    "project management": ("project management",),
+    "c++": ("c++",),
+    "c#": ("c#",),
+    "golang": ("golang",),
+    "postgresql": ("postgresql", "postgres"),
+    "mongodb": ("mongodb",),
+    "graphql": ("graphql",),
+    "linux": ("linux",),
+    "azure": ("azure",),
+    "gcp": ("gcp", "google cloud"),
+    "terraform": ("terraform",),
+}
+
+MAX_SKILLS = 20
+MAX_NAME_LINES = 15
+EDUCATION_SECTION_CHARS = 2000
+EXPERIENCE_SECTION_CHARS = 3000
+
+# The leading guards let the scan skip positions that cannot start a match
+_EMAIL_RE = re.compile(r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_PHONE_RE = re.compile(r"(?=[+(\d])(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}")
+_URL_RE = re.compile(r"https?://[^\s<>\"']+")
+_CAPITALIZED_RE = re.compile(r"\b[A-Z][a-z]{2,15}\b")
+_NAME_SKIP_RE = re.compile(r"@|http|\.com|resume|cv|objective|summary|experience|education", re.I)
+_EDUCATION_HEADING_RE = re.compile(
+    r"\b(?:education|academic|degree|university|college|school|b\.?s\.?|b\.?a\.?|m\.?s\.?|m\.?a\.?|ph\.?d|bachelor|master)(?!\w)",
+    re.I,
+)
+_EXPERIENCE_HEADING_RE = re.compile(r"\b(?:experience|employment|work history|professional)", re.I)
+_INSTITUTION_RE = re.compile(r"university|college|institute|school", re.I)
+_DEGREE_RE = re.compile(r"bachelor|master|phd|b\.s|m\.s|ba |ms ", re.I)
+_YEAR_RE = re.compile(r"20\d{2}|19\d{2}")
+_DASHES_ONLY_RE = re.compile(r"^[\d\-–]+$")
+_DURATION_RE = re.compile(r"20\d{2}\s*[-–]\s*(?:20\d{2}|Present|now)|\d+\s*years?", re.I)
+_COMPANY_SEPARATOR_RE = re.compile(r"\s+at\s+|\s+-\s+|\s+\|\s+")
+
+
+def _trie_pattern(aliases: list[str]) -> str:
+    """Regex alternation over `aliases` factored by common prefix; whitespace inside an alias matches any run."""
+    trie: dict = {}
+    for alias in aliases:
+        node = trie
+        for ch in " ".join(alias.split()):
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [(r"\s+" if ch == " " else re.escape(ch)) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _build_skills_re(skills: dict[str, tuple[str, ...]]) -> tuple[re.Pattern, dict[str, str]]:
+    """Matcher over every alias (run on lowercased text) and the alias -> canonical skill map."""
+    canonical = {" ".join(alias.lower().split()): skill for skill, aliases in skills.items() for alias in aliases}
+    return re.compile(rf"\b{_trie_pattern(list(canonical))}(?![\w+#])"), canonical
+
+
+_SKILLS_RE, _SKILL_BY_ALIAS = _build_skills_re(SKILLS)
+
+
+def register_skills(skills: dict[str, tuple[str, ...]]) -> None:
+    """Add skills (or aliases for existing ones) to the dictionary and rebuild the matcher."""
+    global _SKILLS_RE, _SKILL_BY_ALIAS
+    for skill, aliases in skills.items():
+        SKILLS[skill] = tuple(dict.fromkeys([*SKILLS.get(skill, ()), *aliases]))
+    _SKILLS_RE, _SKILL_BY_ALIAS = _build_skills_re(SKILLS)
 
 
 def _extract_links(text: str) -> list[str]:
-    url_pattern = r"https?://[^\s<>\"']+"
-    urls = re.findall(url_pattern, text)
+    urls = _URL_RE.findall(text)
     linkedin = [u for u in urls if "linkedin.com" in u.lower()]
     github = [u for u in urls if "github.com" in u.lower()]
     other = [u for u in urls if u not in linkedin and u not in github]
     return linkedin[:2] + github[:2] + other[:3]
 
 
-def _guess_name(text: str) -> str | None:
+def _guess_name(lines: list[str]) -> str | None:
     """Best-effort: first line that looks like a name (2–4 words, no URL, no all-caps long)."""
-    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-    for line in lines[:15]:
-        if re.search(r"@|http|\.com|resume|cv|objective|summary|experience|education", line, re.I):
+    for line in lines[:MAX_NAME_LINES]:
+        if _NAME_SKIP_RE.search(line):
             continue
         words = line.split()
         if 2 <= len(words) <= 4 and len(line) < 50:
@@ -35,65 +125,56 @@ def _guess_name(text: str) -> str | None:
     return None
 
 
+def _section_lines(text: str, heading: re.Pattern, max_chars: int) -> list[str]:
+    """Non-empty lines of the `max_chars` following the first heading match; [] when there is none."""
+    m = heading.search(text)
+    if m is None:
+        return []
+    section = text[m.end():m.end() + max_chars]
+    return [ln.strip() for ln in section.split("\n") if ln.strip()]
+
+
 def _extract_education_section(text: str) -> list[dict[str, Any]]:
     entries = []
-    edu_keywords = r"education|academic|degree|university|college|school|b\.?s\.?|b\.?a\.?|m\.?s\.?|m\.?a\.?|ph\.?d|bachelor|master"
-    parts = re.split(re.compile(edu_keywords, re.I), text, maxsplit=1)
-    if len(parts) < 2:
-        return entries
-    section = parts[1][:2000]
-    lines = [ln.strip() for ln in section.split("\n") if ln.strip()]
     current = {}
-    for line in lines[:20]:
-        if re.match(r"^[\d\-–]+$", line) or len(line) < 3:
+    for line in _section_lines(text, _EDUCATION_HEADING_RE, EDUCATION_SECTION_CHARS)[:20]:
+        if _DASHES_ONLY_RE.match(line) or len(line) < 3:
             continue
-        if any(x in line.lower() for x in ["university", "college", "institute", "school"]):
+        if _INSTITUTION_RE.search(line):
             if current:
                 entries.append(current)
             current = {"institution": line[:200], "degree": "", "field": None, "year": None}
-        elif current and ("bachelor" in line.lower() or "master" in line.lower() or "phd" in line.lower() or "b.s" in line.lower() or "m.s" in line.lower() or "ba " in line.lower() or "ms " in line.lower()):
+        elif current and _DEGREE_RE.search(line):
             current["degree"] = line[:150]
-        elif current and re.search(r"20\d{2}|19\d{2}", line):
-            current["year"] = re.search(r"20\d{2}|19\d{2}", line).group(0)
+        elif current and (year := _YEAR_RE.search(line)):
+            current["year"] = year.group(0)
     if current:
         entries.append(current)
     return entries[:5]
 
 
-def _extract_skills_keywords(text: str) -> list[str]:
-    common = [
-        "python", "javascript", "java", "react", "node", "sql", "aws", "docker", "kubernetes",
-        "typescript", "html", "css", "git", "rest", "api", "agile", "scrum", "leadership",
-        "communication", "analytics", "machine learning", "data analysis", "excel", "project management",
-    ]
-    lower = text.lower()
-    found = [s for s in common if s in lower]
-    # Also single-capitalized words that look like skills (short)
-    words = re.findall(r"\b[A-Z][a-z]{2,15}\b", text)
-    for w in words[:30]:
-        if w.lower() not in found and len(found) < 25:
-            found.append(w.lower())
-    return list(dict.fromkeys(found))[:20]
+def _extract_skills_keywords(text: str, lower: str) -> list[str]:
+    """Dictionary skills in order of first mention, topped up with capitalized terms that look like skills."""
+    found = dict.fromkeys(_SKILL_BY_ALIAS[" ".join(m.split())] for m in _SKILLS_RE.findall(lower))
+    for i, m in enumerate(_CAPITALIZED_RE.finditer(text)):
+        if i >= 30 or len(found) >= 25:
+            break
+        found.setdefault(m.group().lower(), None)
+    return list(found)[:MAX_SKILLS]
 
 
 def _extract_experience_section(text: str) -> list[dict[str, Any]]:
     entries = []
-    exp_keywords = r"experience|employment|work history|professional"
-    parts = re.split(re.compile(exp_keywords, re.I), text, maxsplit=1)
-    if len(parts) < 2:
-        return entries
-    section = parts[1][:3000]
-    lines = [ln.strip() for ln in section.split("\n") if ln.strip()]
     current = {}
-    for line in lines[:25]:
+    for line in _section_lines(text, _EXPERIENCE_HEADING_RE, EXPERIENCE_SECTION_CHARS)[:25]:
         if len(line) < 4:
             continue
         # Job title often at start of line; company may follow or on next line
         if current and not current.get("company") and (" at " in line or " - " in line or " | " in line):
-            parts_line = re.split(r"\s+at\s+|\s+-\s+|\s+\|\s+", line, maxsplit=1)
+            parts_line = _COMPANY_SEPARATOR_RE.split(line, maxsplit=1)
             if len(parts_line) >= 2:
                 current["company"] = parts_line[1][:150]
-        if re.search(r"20\d{2}\s*[-–]\s*20\d{2}|20\d{2}\s*[-–]\s*Present|20\d{2}\s*[-–]\s*now", line, re.I) or re.search(r"\d+\s*years?", line, re.I):
+        if _DURATION_RE.search(line):
             if current:
                 current["duration"] = line[:80]
                 entries.append(current)
@@ -122,21 +203,21 @@ def parse_resume_fallback(text: str) -> dict[str, Any]:
             "job_fit_indicators": [],
             "suggested_roles": [],
         }
-    emails = _extract_emails(text)
-    phones = _extract_phones(text)
-    links = _extract_links(text)
+    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
+    emails = list(dict.fromkeys(_EMAIL_RE.findall(text)))
+    phones = list(dict.fromkeys(_PHONE_RE.findall(text)))
     return {
-        "full_name": _guess_name(text),
+        "full_name": _guess_name(lines),
         "email": emails[0] if emails else None,
         "phone": phones[0] if phones else None,
         "location": None,
         "summary": None,
-        "skills": _extract_skills_keywords(text),
+        "skills": _extract_skills_keywords(text, text.lower()),
         "education": _extract_education_section(text),
         "experience": _extract_experience_section(text),
         "certifications": [],
         "strengths": [],
         "job_fit_indicators": [],
         "suggested_roles": [],
-        "_links": links[:5],
+        "_links": _extract_links(text)[:5],
     }
@@ -0,0 +1,223 @@
+"""
+Background resume ingestion. Upload handlers only validate the file, store it and record a queued ResumeJob;
+a small pool of workers started with the app claims jobs from resume_jobs (FOR UPDATE SKIP LOCKED, so every
+app worker can share the table), extracts the text in a process pool and parses it on a thread pool, applies
+the result to the candidate profile and keeps it on the job for clients to poll. Text parsed before is served
+from the parsed_resumes cache. Jobs interrupted by a restart are claimed again once they go stale.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models import Candidate, ResumeJob
+from app.services.job_matcher import update_candidate_embedding_task
+from app.services.resume_cache import get_cached_resume, resume_content_hash, store_parsed_resume
+from app.services.resume_extract import extraction_pool
+from app.services.resume_parser import parse_resume_text
+
+logger = logging.getLogger(__name__)
+
+# Not under uploads/, which is served statically: resumes are only read back by the workers
+RESUME_STORAGE_DIR = Path(__file__).resolve().parent.parent.parent / "storage" / "resumes"
+FINISHED_STATUSES = ("done", "failed")
+MAX_ATTEMPTS = 3  # claims per job before a repeatedly interrupted job is failed
+POLL_SECONDS = 5.0  # idle workers re-check the table this often (jobs from other app workers or restarts)
+
+
+def resume_storage_path(job_id: UUID, filename: str) -> Path:
+    return RESUME_STORAGE_DIR / f"{job_id}{Path(filename).suffix.lower()}"
+
+
+def _discard_file(path: str | None) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def apply_parsed_resume(candidate: Candidate, parsed: dict, text: str) -> None:
+    """Copy parsed fields onto the profile; fields the parser could not find keep their current value."""
+    for field in ("full_name", "location", "skills", "education", "experience"):
+        if parsed.get(field):
+            setattr(candidate, field, parsed[field])
+    candidate.resume_parsed_data = parsed
+    candidate.resume_text = text
+
+
+async def _parse_resume(executor: ThreadPoolExecutor | None, text: str) -> tuple[dict, list[str], bool]:
+    """Parsed resume for this text: from parsed_resumes when the same text was parsed before, else a fresh parse."""
+    content_hash = resume_content_hash(text)
+    async with AsyncSessionLocal() as db:
+        cached = await get_cached_resume(db, content_hash)
+    if cached is not None:
+        return cached
+    # No session held across the OpenAI call
+    parsed, warnings, ai_used = await asyncio.get_running_loop().run_in_executor(executor, parse_resume_text, text)
+    async with AsyncSessionLocal() as db:
+        await store_parsed_resume(db, content_hash, parsed, warnings, ai_used)
+    return parsed, warnings, ai_used
+
+
+async def submit_resume(db: AsyncSession, job_id: UUID, candidate_id: UUID, filename: str, path: str) -> ResumeJob:
+    """
+    Queue an upload already stored at `path` (see resume_storage_path) for parsing. Returns the committed job;
+    never waits on the parse.
+    """
+    job = ResumeJob(id=job_id, candidate_id=candidate_id, filename=filename, file_path=path, status="queued")
+    db.add(job)
+    try:
+        await db.commit()
+    except Exception:
+        _discard_file(path)
+        raise
+    resume_ingestor.notify()
+    return job
+
+
+class ResumeIngestor:
+    """Pool of worker tasks draining resume_jobs."""
+
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: set[UUID] = set()
+
+    def notify(self) -> None:
+        """Wake idle workers; called after a job is committed."""
+        self._wakeup.set()
+
+    async def _claim(self):
+        """Mark the oldest queued (or stale processing) job as ours; None when there is nothing to do."""
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=get_settings().RESUME_JOB_STALE_SECONDS)
+        next_id = (
+            select(ResumeJob.id)
+            .where(or_(
+                ResumeJob.status == "queued",
+                and_(ResumeJob.status == "processing", ResumeJob.started_at < stale),
+            ))
+            .order_by(ResumeJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(ResumeJob)
+                .where(ResumeJob.id == next_id)
+                .values(status="processing", started_at=now, attempts=ResumeJob.attempts + 1)
+                .returning(
+                    ResumeJob.id, ResumeJob.candidate_id, ResumeJob.filename,
+                    ResumeJob.file_path, ResumeJob.attempts,
+                )
+            )
+            job = result.first()
+            await db.commit()
+        return job
+
+    async def _finish(self, job, status: str, **values) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ResumeJob)
+                .where(ResumeJob.id == job.id)
+                .values(status=status, finished_at=datetime.utcnow(), file_path=None, **values)
+            )
+            await db.commit()
+        _discard_file(job.file_path)
+
+    async def _process(self, job) -> None:
+        if job.attempts > MAX_ATTEMPTS or not job.file_path:
+            await self._finish(job, "failed", error="Resume processing was interrupted, please upload again")
+            return
+        try:
+            # Extraction runs in the extraction process pool, the blocking OpenAI call on the ingest thread pool
+            # Full text: it is stored as resume_text for matching and embeddings; the parser truncates its prompt
+            text = await extraction_pool.extract(job.file_path, job.filename)
+            parsed, warnings, ai_used = await _parse_resume(self._executor, text)
+        except ValueError as e:
+            # Unsupported type or too little text: the message is meant for the user
+            await self._finish(job, "failed", error=str(e))
+            return
+        except Exception as e:
+            logger.warning("Resume job %s failed: %s", job.id, type(e).__name__)
+            await self._finish(job, "failed", error="Could not read this file, please try another format")
+            return
+        async with AsyncSessionLocal() as db:
+            candidate = await db.get(Candidate, job.candidate_id)
+            if candidate is not None:
+                apply_parsed_resume(candidate, parsed, text)
+                await db.commit()
+        await self._finish(job, "done", error=None, result={"parsed": parsed, "warnings": warnings, "ai_used": ai_used})
+        await update_candidate_embedding_task(job.candidate_id)
+
+    async def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            job = None
+            try:
+                job = await self._claim()
+                if job is not None:
+                    # Still in _running if the worker is cancelled mid-job, so stop() can requeue it
+                    self._running.add(job.id)
+                    await self._process(job)
+                    self._running.discard(job.id)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if job is not None:
+                    self._running.discard(job.id)
+                logger.warning("Resume worker error: %s", type(e).__name__)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        workers = get_settings().RESUME_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-ingest")
+        self._workers = [asyncio.create_task(self._work()) for _ in range(workers)]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._running:
+            # Hand interrupted jobs straight back to the queue instead of waiting for them to go stale
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(ResumeJob)
+                        .where(ResumeJob.id.in_(list(self._running)), ResumeJob.status == "processing")
+                        .values(status="queued", started_at=None)
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning("Could not requeue %d resume jobs: %s", len(self._running), type(e).__name__)
+            self._running.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        extraction_pool.close()
+
+    def snapshot(self) -> dict:
+        return {"workers": len(self._workers), "running": len(self._running)}
+
+
+resume_ingestor = ResumeIngestor()
@@ -8,6 +8,9 @@ from app.services.resume_fallback import parse_resume_fallback
 
 logger = logging.getLogger(__name__)
 
+RESUME_PARSE_MODEL = "gpt-4o-mini"
+RESUME_PROMPT_CHARS = 12000  # resume text sent to the model
+
 RESUME_EXTRACT_PROMPT = """Extract structured data from this resume text. Return ONLY valid JSON with this exact structure. No markdown, no explanation.
 
 {
@@ -48,10 +51,10 @@ def parse_resume_text(text: str) -> tuple[dict, list[str], bool]:
     try:
         client = OpenAI(api_key=api_key)
         response = client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=RESUME_PARSE_MODEL,
             messages=[
                 {"role": "system", "content": "You extract structured data from resumes. Return only valid JSON."},
-                {"role": "user", "content": f"{RESUME_EXTRACT_PROMPT}\n\n---\n\nResume text:\n\n{text[:12000]}"},
+                {"role": "user", "content": f"{RESUME_EXTRACT_PROMPT}\n\n---\n\nResume text:\n\n{text[:RESUME_PROMPT_CHARS]}"},
             ],
             temperature=0.1,
         )
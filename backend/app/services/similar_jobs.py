@@ -0,0 +1,97 @@
+"""
+Precomputed "similar jobs" lists. Each job caches the ids of its nearest neighbours by embedding
+(jobs.similar_job_ids, served by the HNSW index when computed) so the job detail page reads one row
+instead of running a k-NN query per view. When a job's embedding is rewritten its own list is refreshed, and
+so are the lists that name it; lists older than SIMILAR_JOBS_TTL_SECONDS are recomputed on read, which picks
+up new jobs and drops deleted ones. The lists are a cache: writing one leaves jobs.updated_at alone.
+"""
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import array
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.db.vector_search import apply_vector_search_settings, apply_vector_search_settings_sync
+from app.models import Job
+
+SIMILAR_JOBS_CACHED = 10  # neighbours stored per job; the endpoint serves up to this many
+
+
+def _nearest_stmt(job_id, embedding, k: int = SIMILAR_JOBS_CACHED):
+    return (
+        select(Job.id)
+        .where(Job.id != job_id, Job.embedding != None)
+        .order_by(Job.embedding.cosine_distance(embedding))
+        .limit(k)
+    )
+
+
+def _cache_values(ids) -> dict:
+    return {"b_similar_job_ids": [str(i) for i in ids], "b_similar_computed_at": datetime.utcnow()}
+
+
+def _store_stmt():
+    """
+    Executemany UPDATE of cached lists by id (params from _cache_values plus b_id). Core rather than ORM, with
+    updated_at set to itself, so the column's onupdate does not fire and a cache write never looks like an edit.
+    """
+    jobs = Job.__table__
+    return (
+        update(jobs)
+        .where(jobs.c.id == bindparam("b_id", type_=jobs.c.id.type))
+        .values(
+            similar_job_ids=bindparam("b_similar_job_ids", type_=jobs.c.similar_job_ids.type),
+            similar_computed_at=bindparam("b_similar_computed_at", type_=jobs.c.similar_computed_at.type),
+            updated_at=jobs.c.updated_at,
+        )
+    )
+
+
+def similar_jobs_stale(job: Job) -> bool:
+    """True when the cached list is missing or older than SIMILAR_JOBS_TTL_SECONDS."""
+    if job.similar_job_ids is None or job.similar_computed_at is None:
+        return True
+    ttl = timedelta(seconds=get_settings().SIMILAR_JOBS_TTL_SECONDS)
+    return datetime.utcnow() - job.similar_computed_at > ttl
+
+
+def refresh_similar_jobs_sync(job_id, embedding) -> list[str]:
+    """
+    Recompute and store one job's neighbour list on a session of its own, so a read endpoint never commits
+    its request session. Returns the new list.
+    """
+    with SessionLocal() as db:
+        apply_vector_search_settings_sync(db, SIMILAR_JOBS_CACHED)
+        ids = [r[0] for r in db.execute(_nearest_stmt(job_id, embedding)).all()]
+        values = _cache_values(ids)
+        db.execute(_store_stmt(), [{"b_id": job_id, **values}])
+        db.commit()
+    return values["b_similar_job_ids"]
+
+
+async def refresh_similar_jobs(db: AsyncSession, job_ids) -> int:
+    """
+    Recompute neighbour lists for the given jobs, and for every job whose cached list names one of them,
+    in one bulk UPDATE and commit. Returns jobs updated.
+    """
+    ids = [UUID(str(i)) for i in job_ids]
+    if not ids:
+        return 0
+    listed_by = select(Job.id).where(Job.similar_job_ids.has_any(array([str(i) for i in ids])))
+    result = await db.execute(
+        select(Job.id, Job.embedding).where(or_(Job.id.in_(ids), Job.id.in_(listed_by)), Job.embedding != None)
+    )
+    rows = result.all()
+    await apply_vector_search_settings(db, SIMILAR_JOBS_CACHED)
+    params = []
+    for job_id, embedding in rows:
+        neighbours = [r[0] for r in (await db.execute(_nearest_stmt(job_id, embedding))).all()]
+        params.append({"b_id": job_id, **_cache_values(neighbours)})
+    if params:
+        await db.execute(_store_stmt(), params)
+        await db.commit()
+    return len(params)
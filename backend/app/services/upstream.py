@@ -0,0 +1,227 @@
+"""
+Guards for third-party job APIs: a per-source token bucket that keeps us inside the provider's rate quota,
+retries with exponential backoff and full jitter on 429/5xx/transport errors (honouring Retry-After),
+and a circuit breaker that stops calling a failing source for a cool-down instead of paying its timeout
+on every refresh. Each guard keeps call counters and the provider's last reported quota for /external-jobs/status.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 20.0
+MAX_TOKEN_WAIT_SECONDS = 60.0  # longer than this and the call is skipped instead of queued
+# Quota headers sent by RapidAPI (JSearch) and other providers
+QUOTA_LIMIT_HEADERS = ("x-ratelimit-requests-limit", "x-ratelimit-limit")
+QUOTA_REMAINING_HEADERS = ("x-ratelimit-requests-remaining", "x-ratelimit-remaining")
+
+
+class UpstreamError(Exception):
+    """The source could not be called or kept failing; the caller treats the page as unavailable."""
+
+
+class SourceUnavailable(UpstreamError):
+    """Circuit open or local quota exhausted: no request was made."""
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` requests on average with bursts up to `burst`."""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: float = MAX_TOKEN_WAIT_SECONDS) -> bool:
+        """Take one token, waiting up to `max_wait` for it. False if the wait would be longer."""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+                if wait > max_wait:
+                    return False
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; after `cooldown` seconds lets one trial call through."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        """True if a call may go out. Half-open admits a single trial until its success or failure is recorded."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self.trial_in_flight:
+            return False
+        self.trial_in_flight = True
+        return True
+
+    def release_trial(self) -> None:
+        """Give up the half-open trial slot when the call ended without an outcome (throttled, cancelled, crashed)."""
+        self.trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.trial_in_flight = False
+        self.failures += 1
+        if self.failures >= self.threshold or self.opened_at is not None:
+            # Trip, or re-trip after a failed half-open trial
+            self.opened_at = time.monotonic()
+
+
+class SourceGuard:
+    """Rate limit + retry + circuit breaker + metrics around one upstream source."""
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_retries: int, threshold: int, cooldown: float):
+        self.name = name
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.breaker = CircuitBreaker(threshold, cooldown)
+        self.max_retries = max_retries
+        self.metrics = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "throttled": 0,
+            "short_circuited": 0,
+        }
+        self.quota_limit: int | None = None
+        self.quota_remaining: int | None = None
+        self.last_status: int | None = None
+        self.last_error: str | None = None
+
+    def _record_quota(self, resp: httpx.Response) -> None:
+        for attr, headers in (("quota_limit", QUOTA_LIMIT_HEADERS), ("quota_remaining", QUOTA_REMAINING_HEADERS)):
+            for header in headers:
+                value = resp.headers.get(header)
+                if value is not None and value.isdigit():
+                    setattr(self, attr, int(value))
+                    break
+
+    def _backoff(self, attempt: int, resp: httpx.Response | None) -> float:
+        retry_after = resp.headers.get("retry-after") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    async def request(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Run `send` under the guard and return a 2xx response. Raises SourceUnavailable without calling out when
+        the circuit is open or the quota is spent, UpstreamError when retries are exhausted or the response is
+        a non-retryable error.
+        """
+        trial = self.breaker.state == "half_open"
+        if not self.breaker.allow():
+            self.metrics["short_circuited"] += 1
+            raise SourceUnavailable(f"{self.name}: circuit open")
+        try:
+            for attempt in range(self.max_retries + 1):
+                if not await self.bucket.acquire():
+                    self.metrics["throttled"] += 1
+                    raise SourceUnavailable(f"{self.name}: local rate quota exhausted")
+                self.metrics["calls"] += 1
+                resp = None
+                try:
+                    resp = await send()
+                    self.last_status = resp.status_code
+                    self._record_quota(resp)
+                    if resp.is_success:
+                        self.metrics["succeeded"] += 1
+                        self.breaker.record_success()
+                        return resp
+                    error = f"HTTP {resp.status_code}"
+                    retryable = resp.status_code in RETRY_STATUSES
+                except httpx.TransportError as e:
+                    error = type(e).__name__
+                    retryable = True
+                self.last_error = error
+                if not retryable or attempt == self.max_retries:
+                    break
+                self.metrics["retries"] += 1
+                delay = self._backoff(attempt, resp)
+                logger.info("%s: %s, retrying in %.1fs (attempt %d)", self.name, error, delay, attempt + 1)
+                await asyncio.sleep(delay)
+            self.metrics["failed"] += 1
+            self.breaker.record_failure()
+            logger.warning("%s: giving up after %s (circuit %s)", self.name, self.last_error, self.breaker.state)
+            raise UpstreamError(f"{self.name}: {self.last_error}")
+        finally:
+            if trial:
+                self.breaker.release_trial()
+
+    def snapshot(self) -> dict:
+        return {
+            **self.metrics,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "local_tokens": round(self.bucket.tokens, 2),
+            "rate_per_minute": round(self.bucket.rate * 60, 2),
+            "quota_limit": self.quota_limit,
+            "quota_remaining": self.quota_remaining,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+        }
+
+
+def _build_guards() -> dict[str, SourceGuard]:
+    s = get_settings()
+    common = {
+        "max_retries": s.UPSTREAM_MAX_RETRIES,
+        "threshold": s.UPSTREAM_BREAKER_THRESHOLD,
+        "cooldown": s.UPSTREAM_BREAKER_COOLDOWN_SECONDS,
+    }
+    return {
+        "adzuna": SourceGuard("adzuna", s.ADZUNA_REQUESTS_PER_MINUTE, burst=5, **common),
+        "jsearch": SourceGuard("jsearch", s.JSEARCH_REQUESTS_PER_MINUTE, burst=5, **common),
+    }
+
+
+_guards: dict[str, SourceGuard] | None = None
+
+
+def source_guard(source: str) -> SourceGuard:
+    global _guards
+    if _guards is None:
+        _guards = _build_guards()
+    return _guards[source]
+
+
+def source_status() -> dict:
+    """Per-source call counters, circuit state and quota for the status endpoint."""
+    return {name: source_guard(name).snapshot() for name in ("adzuna", "jsearch")}
@@ -0,0 +1,154 @@
+"""
+Backfill / re-embed jobs, candidates and external jobs. Run from backend dir with venv activated.
+Picks rows with no embedding, or whose embedding_model differs from OPENAI_EMBEDDING_MODEL, walks them in
+keyset-paginated batches (ordered by id), embeds each batch in bulk and checkpoints the last id so an
+interrupted run resumes where it stopped.
+
+Usage: python scripts/backfill_embeddings.py [--kind all|job|candidate|external_job] [--batch-size 256]
+                                             [--rpm 60] [--checkpoint PATH] [--reset] [--max-rows N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from itertools import takewhile
+from uuid import UUID
+
+# Run from backend root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"))
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.services.embeddings import EMBEDDABLE, MAX_INPUTS_PER_REQUEST, embed_rows, embedding_scope
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".embedding_backfill.json")
+
+
+class RequestThrottle:
+    """Spaces embeddings requests so the run stays within a requests-per-minute budget."""
+
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next_at = 0.0
+        self.requests = 0
+
+    async def __call__(self) -> None:
+        now = time.monotonic()
+        if now < self._next_at:
+            await asyncio.sleep(self._next_at - now)
+        self._next_at = max(now, self._next_at) + self.interval
+        self.requests += 1
+
+
+def _load_checkpoint(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_checkpoint(path: str, state: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _needs_embedding(kind: str, model: str):
+    model_cls = EMBEDDABLE[kind]
+    return and_(
+        or_(model_cls.embedding == None, model_cls.embedding_model.is_distinct_from(model)),
+        *embedding_scope(kind),
+    )
+
+
+async def backfill_kind(kind: str, args, state: dict, throttle: RequestThrottle) -> None:
+    model_cls = EMBEDDABLE[kind]
+    model = get_settings().OPENAI_EMBEDDING_MODEL
+    progress = state.get(kind) or {}
+    if progress.get("model") != model:
+        # New target model: start over from the beginning of the table
+        progress = {"model": model, "last_id": None, "embedded": 0, "scanned": 0}
+    last_id = UUID(progress["last_id"]) if progress.get("last_id") else None
+
+    async with AsyncSessionLocal() as db:
+        pending_q = select(func.count()).select_from(model_cls).where(_needs_embedding(kind, model))
+        if last_id:
+            pending_q = pending_q.where(model_cls.id > last_id)
+        remaining = (await db.execute(pending_q)).scalar_one()
+    print(f"{kind}: {remaining} row(s) to embed with {model}" + (f" (resuming after {last_id})" if last_id else ""))
+
+    started = time.monotonic()
+    done_this_run = 0
+    while remaining and (not args.max_rows or done_this_run < args.max_rows):
+        async with AsyncSessionLocal() as db:
+            page_q = select(model_cls.id).where(_needs_embedding(kind, model)).order_by(model_cls.id)
+            if last_id:
+                page_q = page_q.where(model_cls.id > last_id)
+            ids = [r[0] for r in (await db.execute(page_q.limit(args.batch_size))).all()]
+        if not ids:
+            break
+        embedded = await embed_rows(kind, ids, throttle=throttle)
+        # Checkpoint only past the leading run of rows that really got a vector; anything after the first
+        # failure is picked up again by the next batch (or the next run)
+        async with AsyncSessionLocal() as db:
+            pending_q = select(model_cls.id).where(model_cls.id.in_(ids), _needs_embedding(kind, model))
+            pending = {r[0] for r in (await db.execute(pending_q)).all()}
+        written = list(takewhile(lambda row_id: row_id not in pending, ids))
+        if not written:
+            print("  No vectors written for this batch (missing OPENAI_API_KEY or API errors); stopping.")
+            break
+        last_id = written[-1]
+        done_this_run += len(written)
+        progress.update(
+            last_id=str(last_id),
+            embedded=progress.get("embedded", 0) + embedded,
+            scanned=progress.get("scanned", 0) + len(written),
+        )
+        state[kind] = progress
+        _save_checkpoint(args.checkpoint, state)
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        pct = min(100.0, 100.0 * done_this_run / remaining)
+        print(
+            f"  {kind}: {done_this_run}/{remaining} ({pct:.1f}%) embedded={embedded}/{len(ids)} "
+            f"rate={done_this_run / elapsed:.1f} rows/s requests={throttle.requests}"
+        )
+    print(f"{kind}: finished, {progress.get('embedded', 0)} embedded in total for {model}")
+
+
+async def main_async(args) -> None:
+    if not os.getenv("OPENAI_API_KEY"):
+        print("OPENAI_API_KEY is not set; nothing can be embedded.")
+        sys.exit(1)
+    state = {} if args.reset else _load_checkpoint(args.checkpoint)
+    throttle = RequestThrottle(args.rpm)
+    kinds = list(EMBEDDABLE) if args.kind == "all" else [args.kind]
+    for kind in kinds:
+        await backfill_kind(kind, args, state, throttle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill or re-embed rows for vector matching.")
+    parser.add_argument("--kind", choices=["all", *EMBEDDABLE], default="all")
+    parser.add_argument("--batch-size", type=int, default=256, help=f"Rows per batch (<= {MAX_INPUTS_PER_REQUEST} keeps one request per batch)")
+    parser.add_argument("--rpm", type=int, default=60, help="Max embeddings requests per minute (0 = unthrottled)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Progress file used to resume")
+    parser.add_argument("--reset", action="store_true", help="Ignore the checkpoint and start from the first row")
+    parser.add_argument("--max-rows", type=int, default=0, help="Stop each kind after this many rows (0 = all)")
+    args = parser.parse_args()
+    args.batch_size = max(1, args.batch_size)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -83,6 +83,12 @@ def main():
                 created += 1
         db.commit()
         print(f"Created {created} demo job(s). Browse Jobs should now list them.")
+        if os.getenv("OPENAI_API_KEY"):
+            # One multi-input embeddings request + one bulk UPDATE for every job still lacking a vector
+            import asyncio
+            from app.services.embeddings import embed_pending
+            embedded = asyncio.run(embed_pending("job"))
+            print(f"Embedded {embedded} job(s) for semantic matching.")
     finally:
         db.close()
 
@@ -0,0 +1,47 @@
+from app.services.job_dedup import MIN_DESCRIPTION_WORDS, _near_duplicate, _words, job_fingerprint
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to design and build services for our payments platform. "
+    "You will work with Python, Postgres and Kafka, own features end to end, review code, mentor "
+    "junior engineers and help us scale a system that moves billions of dollars every year. "
+    "Benefits include remote work, equity, health insurance and a yearly learning budget."
+)
+
+
+def test_fingerprint_ignores_case_punctuation_and_company_suffix():
+    a = {"title": "Senior Backend Engineer", "company": "Acme, Inc.", "location": "Austin, TX"}
+    b = {"title": "senior backend engineer!", "company": "ACME", "location": "Austin, Texas, US"}
+    assert job_fingerprint(a) == job_fingerprint(b)
+
+
+def test_fingerprint_keeps_cities_apart():
+    a = {"title": "Backend Engineer", "company": "Acme", "location": "Austin, TX"}
+    b = {"title": "Backend Engineer", "company": "Acme", "location": "Denver, CO"}
+    assert job_fingerprint(a) != job_fingerprint(b)
+
+
+def test_snippet_matches_full_description():
+    full = _words(DESCRIPTION)
+    snippet = full[:30]
+    assert _near_duplicate(snippet, full)
+    assert _near_duplicate(full, snippet)
+
+
+def test_light_rewording_is_a_duplicate():
+    full = _words(DESCRIPTION)
+    reworded = _words(DESCRIPTION.replace("Benefits include", "Perks are"))
+    assert _near_duplicate(full, reworded)
+
+
+def test_short_descriptions_are_never_duplicates():
+    words = _words(DESCRIPTION)[: MIN_DESCRIPTION_WORDS - 1]
+    assert not _near_duplicate(words, list(words))
+
+
+def test_different_descriptions_are_not_duplicates():
+    other = _words(
+        "Join our retail team as a store associate. You will greet customers, restock shelves, run the "
+        "register, keep the floor tidy and help with seasonal inventory counts. Weekend availability is "
+        "required, and we offer an employee discount, flexible shifts and paid training for new staff."
+    )
+    assert not _near_duplicate(_words(DESCRIPTION), other)
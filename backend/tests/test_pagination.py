@@ -0,0 +1,32 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 18, 12, 30, 15, 123456)
+    row_id = uuid4()
+    cursor = encode_cursor("recent", created_at, 0.1 + 0.2, row_id)
+    assert decode_cursor(cursor, 4) == ["recent", created_at, 0.1 + 0.2, str(row_id)]
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("relevance", 0.5, str(uuid4()), 42)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!", encode_cursor(1, 2)[:-3]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, 2)
+    assert exc.value.status_code == 400
+
+
+def test_cursor_of_wrong_shape_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(encode_cursor("recent", 1.0, "id"), 2)
+    assert exc.value.status_code == 400
@@ -0,0 +1,27 @@
+from app.services.resume_fallback import SKILLS, _build_skills_re
+
+
+def _skills(text: str) -> set[str]:
+    pattern, by_alias = _build_skills_re(SKILLS)
+    return {by_alias[" ".join(m.split())] for m in pattern.findall(text.lower())}
+
+
+def test_longer_skill_wins_over_its_prefix():
+    assert _skills("Senior JavaScript developer") == {"javascript"}
+    assert _skills("Java and JavaScript") == {"java", "javascript"}
+
+
+def test_symbol_skills_match():
+    assert _skills("Wrote C++, C# and some C") == {"c++", "c#"}
+
+
+def test_aliases_map_to_canonical_skill():
+    assert _skills("Node.js services on Postgres, deployed to k8s") == {"node", "postgresql", "kubernetes"}
+
+
+def test_skills_need_word_boundaries():
+    assert _skills("reactive programming, legitimate restaurants") == set()
+
+
+def test_multi_word_skills_tolerate_extra_whitespace():
+    assert _skills("machine   learning and\nproject management") == {"machine learning", "project management"}
@@ -0,0 +1,23 @@
+import pytest
+
+from app.db.text_search import MAX_QUERY_TERMS, build_tsquery
+
+
+def test_terms_become_prefix_matches():
+    assert build_tsquery("Data Eng") == "data:* & eng:*"
+    assert build_tsquery("data eng", match_any=True) == "data:* | eng:*"
+
+
+def test_operators_are_stripped():
+    assert build_tsquery("c & !python | (rust):*") == "c:* & python:* & rust:*"
+
+
+def test_duplicate_terms_are_dropped_and_terms_capped():
+    assert build_tsquery("go GO go") == "go:*"
+    words = " ".join(f"term{i}" for i in range(MAX_QUERY_TERMS + 4))
+    assert build_tsquery(words).count(":*") == MAX_QUERY_TERMS
+
+
+@pytest.mark.parametrize("q", [None, "", "   ", "&|!()"])
+def test_nothing_searchable_gives_none(q):
+    assert build_tsquery(q) is None
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import upstream
+from app.services.upstream import CircuitBreaker, SourceGuard, SourceUnavailable, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Only the module's clock: patching time.monotonic itself would also freeze the event loop
+    fake = FakeClock()
+    monkeypatch.setattr(upstream, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+def test_breaker_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=30)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_admits_one_half_open_trial(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # trial in flight
+
+
+def test_breaker_closes_after_successful_trial(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_breaker_reopens_after_failed_trial(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+
+def test_breaker_release_frees_trial_slot(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_guard_gives_back_trial_when_throttled(clock):
+    guard = SourceGuard("test", rate_per_minute=0, burst=1, max_retries=0, threshold=1, cooldown=30)
+    guard.bucket.tokens = 0
+    guard.breaker.record_failure()
+    clock.now += 30
+
+    async def send():
+        raise AssertionError("must not be called")
+
+    with pytest.raises(SourceUnavailable):
+        asyncio.run(guard.request(send))
+    assert guard.metrics["throttled"] == 1
+    assert guard.breaker.allow()
+
+
+def test_token_bucket_allows_burst_then_refuses_long_waits(clock):
+    bucket = TokenBucket(rate_per_minute=1, burst=2)
+
+    async def take(n):
+        return [await bucket.acquire(max_wait=1) for _ in range(n)]
+
+    assert asyncio.run(take(3)) == [True, True, False]
+    clock.now += 60
+    assert asyncio.run(take(1)) == [True]
@@ -19,16 +19,17 @@ type ExternalJob = {
 };
 
 export default function EmployerMarketPage() {
-  const { role } = useAuth();
+  const { role, session } = useAuth();
   const [jobs, setJobs] = useState<ExternalJob[]>([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    apiGet<ExternalJob[]>("/external-jobs?refresh=true")
+    if (!session?.access_token) return;
+    apiGet<ExternalJob[]>("/external-jobs?refresh=true", session.access_token)
       .then(setJobs)
       .catch(() => setJobs([]))
       .finally(() => setLoading(false));
-  }, []);
+  }, [session?.access_token]);
 
   if (role !== "employer") return null;
 
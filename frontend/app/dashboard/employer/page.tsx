@@ -4,7 +4,7 @@ import { useEffect, useState, useCallback } from "react";
 import Link from "next/link";
 import { motion, AnimatePresence } from "framer-motion";
 import { useAuth } from "@/contexts/AuthContext";
-import { apiGet, apiPost, apiDelete } from "@/lib/api";
+import { apiGet, apiGetPage, apiPost, apiDelete } from "@/lib/api";
 import { Input } from "@/components/ui/Input";
 import { Button } from "@/components/ui/Button";
 import { useToast } from "@/components/ui/Toast";
@@ -18,7 +18,9 @@ import {
 
 ChartJS.register(CategoryScale, LinearScale, PointElement, LineElement, Title, Tooltip, Legend, ArcElement);
 
-type Job = { id: string; title: string; description?: string | null; location: string | null; remote: boolean | null; created_at?: string; };
+const JOBS_PAGE_PATH = "/jobs/mine?fields=id,title,location,remote,created_at,applicant_count&limit=50";
+
+type Job = { id: string; title: string; description?: string | null; location: string | null; remote: boolean | null; created_at?: string; applicant_count?: number; };
 type EmployerProfile = { id: string; company_name: string; industry: string | null; };
 type Applicant = { id: string; job_id: string; job_title?: string; candidate_id: string; candidate_name: string | null; candidate_location: string | null; candidate_skills: string[] | null; status: string; created_at: string | null; };
 
@@ -49,7 +51,8 @@ export default function EmployerDashboardPage() {
   const [submitting, setSubmitting] = useState(false);
   const [jobError, setJobError] = useState("");
   const [jobToDelete, setJobToDelete] = useState<string | null>(null);
-  const [applicantCounts, setApplicantCounts] = useState<Record<string, number>>({});
+  const [jobsCursor, setJobsCursor] = useState<string | null>(null);
+  const [loadingMoreJobs, setLoadingMoreJobs] = useState(false);
   const [allApplicants, setAllApplicants] = useState<(Applicant & { job_title?: string })[]>([]);
 
   const loadData = useCallback(async () => {
@@ -59,23 +62,28 @@ export default function EmployerDashboardPage() {
       const profileRes = await apiGet<EmployerProfile>("/employers/me", session.access_token).catch(() => null);
       setProfile(profileRes);
       if (!profileRes?.id) return;
-      const jobsRes = await apiGet<Job[]>("/jobs/mine", session.access_token).catch(() => []);
-      setJobs(jobsRes);
-      
-      const counts: Record<string, number> = {};
-      const applicants: (Applicant & { job_title?: string })[] = [];
-      for (const job of jobsRes) {
-        try {
-           const apps = await apiGet<Applicant[]>(`/applications/by-job/${job.id}`, session.access_token);
-           counts[job.id] = apps.length;
-           apps.forEach(a => applicants.push({ ...a, job_title: job.title, job_id: job.id }));
-        } catch { counts[job.id] = 0; }
-      }
-      setApplicantCounts(counts);
-      setAllApplicants(applicants.sort((a,b) => new Date(b.created_at || 0).getTime() - new Date(a.created_at || 0).getTime()));
+      const [jobsPage, applicants] = await Promise.all([
+        apiGetPage<Job>(JOBS_PAGE_PATH, session.access_token).catch(() => ({ items: [] as Job[], nextCursor: null })),
+        apiGet<Applicant[]>("/applications/by-employer/me", session.access_token).catch(() => [] as Applicant[]),
+      ]);
+      setJobs(jobsPage.items);
+      setJobsCursor(jobsPage.nextCursor);
+      setAllApplicants(applicants);
     } finally { setLoading(false); }
   }, [user, session]);
 
+  const loadMoreJobs = async () => {
+    if (!jobsCursor || !session?.access_token) return;
+    setLoadingMoreJobs(true);
+    try {
+      const page = await apiGetPage<Job>(JOBS_PAGE_PATH, session.access_token, jobsCursor);
+      setJobs(prev => [...prev, ...page.items]);
+      setJobsCursor(page.nextCursor);
+    } catch {
+      toast.error("Failed to load more jobs");
+    } finally { setLoadingMoreJobs(false); }
+  };
+
   useEffect(() => { loadData(); }, [loadData]);
 
   const handleCreateJob = async (e: React.FormEvent) => {
@@ -252,7 +260,7 @@ export default function EmployerDashboardPage() {
                                     <h4 className="text-white font-bold">{job.title}</h4>
                                     <p className="text-xs text-gray-400 mt-1">{job.location || "Remote"}</p>
                                  </td>
-                                 <td className="py-4 font-black text-white">{applicantCounts[job.id] || 0}</td>
+                                 <td className="py-4 font-black text-white">{job.applicant_count ?? 0}</td>
                                  <td className="py-4">
                                     <span className="bg-[var(--accent-secondary)]/10 text-[var(--accent-secondary)] border border-[var(--accent-secondary)]/30 px-3 py-1 rounded-full text-[10px] font-black tracking-widest uppercase">
                                        ACTIVE
@@ -268,6 +276,13 @@ export default function EmployerDashboardPage() {
                            ))}
                         </tbody>
                      </table>
+                     {jobsCursor && (
+                        <div className="flex justify-center pt-6">
+                           <Button onClick={loadMoreJobs} disabled={loadingMoreJobs} className="bg-white/10 hover:bg-white/20 text-white">
+                              {loadingMoreJobs ? "Loading..." : "Load more"}
+                           </Button>
+                        </div>
+                     )}
                   </div>
                )}
             </motion.div>
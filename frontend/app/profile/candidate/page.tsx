@@ -31,6 +31,30 @@ type CandidateProfile = {
   resume_parsed_data?: unknown;
 };
 
+type ResumeJob = {
+  job_id: string;
+  status: "queued" | "processing" | "done" | "failed";
+  error?: string | null;
+  parsed?: Record<string, unknown>;
+  warnings?: string[];
+  ai_used?: boolean;
+};
+
+const RESUME_POLL_MS = 1500;
+const RESUME_POLL_TIMEOUT_MS = 120_000;
+
+/** Resume parsing runs in the background: poll the upload's job until it is done or failed. */
+async function waitForResumeJob(jobId: string, token: string): Promise<ResumeJob> {
+  const deadline = Date.now() + RESUME_POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const job = await apiGet<ResumeJob>(`/candidates/me/resume/jobs/${jobId}`, token);
+    if (job.status === "done") return job;
+    if (job.status === "failed") throw new Error(job.error || "Resume parsing failed");
+    await new Promise((r) => setTimeout(r, RESUME_POLL_MS));
+  }
+  throw new Error("Resume parsing is taking longer than expected. Refresh the page in a minute.");
+}
+
 const selectClass = "w-full px-4 py-2.5 rounded-lg bg-zinc-900/50 border border-white/10 text-white focus:outline-none focus:ring-2 focus:ring-teal-500/50";
 
 export default function CandidateProfilePage() {
@@ -103,11 +127,8 @@ export default function CandidateProfilePage() {
     setResumeError("");
     setResumeWarning("");
     try {
-      const res = await apiUpload<{
-        parsed: Record<string, unknown>;
-        warnings?: string[];
-        ai_used?: boolean;
-      }>(`/candidates/me/resume`, file, session.access_token);
+      const job = await apiUpload<ResumeJob>(`/candidates/me/resume`, file, session.access_token);
+      const res = await waitForResumeJob(job.job_id, session.access_token);
       setFullName((res.parsed?.full_name as string) || fullName);
       if (Array.isArray(res.parsed?.skills) && res.parsed.skills.length) {
         setSkillsText((res.parsed.skills as string[]).join(", "));
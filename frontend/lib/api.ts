@@ -68,11 +68,11 @@ async function fetchWithResilience(
   throw lastError ?? new Error("Request failed after retries");
 }
 
-export async function apiFetch<T>(
+async function checkedFetch(
   path: string,
   options?: RequestInit,
   token?: string | null
-): Promise<T> {
+): Promise<Response> {
   let res: Response;
   try {
     res = await fetchWithResilience(path, options, token);
@@ -94,9 +94,37 @@ export async function apiFetch<T>(
     }
     throw new APIError(message, res.status, err);
   }
+  return res;
+}
+
+export async function apiFetch<T>(
+  path: string,
+  options?: RequestInit,
+  token?: string | null
+): Promise<T> {
+  const res = await checkedFetch(path, options, token);
   return res.json();
 }
 
+const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+
+export type Page<T> = { items: T[]; nextCursor: string | null };
+
+/** GET one page of a cursor-paginated list; pass the returned nextCursor to fetch the page after it. */
+export async function apiGetPage<T>(
+  path: string,
+  token?: string | null,
+  cursor?: string | null
+): Promise<Page<T>> {
+  const sep = path.includes("?") ? "&" : "?";
+  const res = await checkedFetch(
+    cursor ? `${path}${sep}cursor=${encodeURIComponent(cursor)}` : path,
+    undefined,
+    token
+  );
+  return { items: (await res.json()) as T[], nextCursor: res.headers.get(NEXT_CURSOR_HEADER) };
+}
+
 export async function api<T>(
   path: string,
   options?: RequestInit,